@@ -27,11 +27,47 @@ from pathlib import Path
 import re
 import hashlib
 from enum import Enum
+import functools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Orders at least this large are summed by the compiled kernels below; for
+# smaller ones the interpreted loop is cheaper than building the array
+ORDER_KERNEL_MIN_ITEMS = 64
+
+
+def _order_total(rows: Any) -> float:
+    # rows[i] = (price, quantity, discount %, tax rate). Summed in item order,
+    # without fastmath, so the result matches the interpreted loop exactly
+    total = 0.0
+    for i in range(rows.shape[0]):
+        subtotal = rows[i, 0] * rows[i, 1]
+        taxable_amount = subtotal - subtotal * (rows[i, 2] / 100)
+        total += taxable_amount + taxable_amount * rows[i, 3]
+    return total
+
+
+def _order_subtotal(rows: Any) -> float:
+    # rows[i] = (price, quantity)
+    subtotal = 0.0
+    for i in range(rows.shape[0]):
+        subtotal += rows[i, 0] * rows[i, 1]
+    return subtotal
+
+
+@functools.lru_cache(maxsize=None)
+def _pricing_kernels() -> Optional[Tuple[Any, Any, Any]]:
+    # numpy and numba are optional and only imported for the first large
+    # order; without them every order takes the interpreted loop
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+    return np, njit(cache=True)(_order_total), njit(cache=True)(_order_subtotal)
+
 class UserValidator:
     """
     Validates user data.
@@ -210,13 +246,18 @@ class OrderProcessor:
     def calculate_order_total(self, items: List[Dict[str, Any]]) -> float:
         """Calculate order total."""
         # Bug: Duplicated business logic
-        total = 0.0
-        for item in items:
-            price = float(item.get("price", 0))
-            quantity = int(item.get("quantity", 0))
-            discount = float(item.get("discount", 0))
-            tax_rate = float(item.get("tax_rate", 0.1))
+        rows = [
+            (float(item.get("price", 0)), int(item.get("quantity", 0)),
+             float(item.get("discount", 0)), float(item.get("tax_rate", 0.1)))
+            for item in items
+        ]
+        kernels = _pricing_kernels() if len(rows) >= ORDER_KERNEL_MIN_ITEMS else None
+        if kernels is not None:
+            np, order_total, _ = kernels
+            return float(order_total(np.array(rows, dtype=np.float64)))
 
+        total = 0.0
+        for price, quantity, discount, tax_rate in rows:
             subtotal = price * quantity
             discount_amount = subtotal * (discount / 100)
             taxable_amount = subtotal - discount_amount
@@ -250,11 +291,16 @@ class OrderProcessor:
     def calculate_discount(self, items: List[Dict[str, Any]], coupon: Optional[str] = None) -> float:
         """Calculate discount amount."""
         # Bug: Duplicated business logic
-        subtotal = 0.0
-        for item in items:
-            price = float(item.get("price", 0))
-            quantity = int(item.get("quantity", 0))
-            subtotal += price * quantity
+        rows = [(float(item.get("price", 0)), int(item.get("quantity", 0)))
+                for item in items]
+        kernels = _pricing_kernels() if len(rows) >= ORDER_KERNEL_MIN_ITEMS else None
+        if kernels is not None:
+            np, _, order_subtotal = kernels
+            subtotal = float(order_subtotal(np.array(rows, dtype=np.float64)))
+        else:
+            subtotal = 0.0
+            for price, quantity in rows:
+                subtotal += price * quantity
 
         discount_rate = 0.0
         if coupon == "SAVE10":
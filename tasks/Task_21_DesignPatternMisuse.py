@@ -48,29 +48,28 @@ The task is to identify and fix the following pattern misuses:
 Review the code and identify these pattern misuses.
 """
 
-import json
+import sys
 import time
+import collections
 import random
-from typing import List, Dict, Any, Optional, Union, Tuple, Protocol
+from typing import List, Dict, Any, Optional, Union, Tuple, Protocol, Iterator, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
-from pathlib import Path
-import re
-import hashlib
 from enum import Enum
 import sqlite3
 import os
-import requests
-import redis
-import smtplib
-from email.mime.text import MIMEText
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from operator import methodcaller
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of entries kept in LoggingDecorator.logs
+LOG_CAP = 1024
+
 # Bug: Singleton Pattern Misuse - Unnecessary global state
 class DatabaseManager:
     """
@@ -90,6 +89,7 @@ class DatabaseManager:
         if not self._initialized:
             self.connection = sqlite3.connect('app.db')
             self.cursor = self.connection.cursor()
+            self._in_bulk = False
             self._initialized = True
 
     def execute_query(self, query: str, params: tuple = ()) -> List[Any]:
@@ -99,7 +99,33 @@ class DatabaseManager:
     def execute_update(self, query: str, params: tuple = ()) -> None:
         # Bug: Global state modification
         self.cursor.execute(query, params)
-        self.connection.commit()
+        # Commit is deferred to bulk() exit while a batch is open
+        if not self._in_bulk:
+            self.connection.commit()
+
+    def execute_many(self, query: str, seq_of_params: List[tuple]) -> None:
+        # Row batches go through sqlite's executemany bind loop
+        self.cursor.executemany(query, seq_of_params)
+        if not self._in_bulk:
+            self.connection.commit()
+
+    @contextmanager
+    def bulk(self) -> Iterator['DatabaseManager']:
+        # Batch updates into a single transaction: one commit on success,
+        # rolled back as a whole if the block raises
+        if self._in_bulk:
+            yield self
+            return
+        self._in_bulk = True
+        try:
+            yield self
+        except BaseException:
+            self.connection.rollback()
+            raise
+        else:
+            self.connection.commit()
+        finally:
+            self._in_bulk = False
 
 # Bug: Factory Pattern Misuse - Complex factory with mixed responsibilities
 class PaymentFactory:
@@ -107,37 +133,27 @@ class PaymentFactory:
     Factory Pattern Misuse: Complex factory with mixed responsibilities.
     """
     def __init__(self):
-        # Bug: Factory with too many responsibilities
-        self.payment_methods = {
-            'credit_card': self._create_credit_card_payment,
-            'paypal': self._create_paypal_payment,
-            'bank_transfer': self._create_bank_transfer_payment
-        }
-        self.validation_rules = {
-            'credit_card': self._validate_credit_card,
-            'paypal': self._validate_paypal,
-            'bank_transfer': self._validate_bank_transfer
-        }
-        self.processing_rules = {
-            'credit_card': self._process_credit_card,
-            'paypal': self._process_paypal,
-            'bank_transfer': self._process_bank_transfer
-        }
+        # Instance-local PRNG avoids the shared module-level random state
+        self._rng = random.Random()
 
     def create_payment(self, method: str, data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Mixed factory and strategy
-        if method not in self.payment_methods:
+        # Dispatch tables are class-level and hold unbound functions
+        cls = type(self)
+        # Keys parsed from external input are not interned by default
+        method = sys.intern(method)
+        if method not in cls.payment_methods:
             raise ValueError(f"Unsupported payment method: {method}")
 
         # Validate payment data
-        if not self.validation_rules[method](data):
+        if not cls.validation_rules[method](self, data):
             raise ValueError(f"Invalid payment data for {method}")
 
         # Create payment object
-        payment = self.payment_methods[method](data)
+        payment = cls.payment_methods[method](self, data)
 
         # Process payment
-        result = self.processing_rules[method](payment)
+        result = cls.processing_rules[method](self, payment)
 
         # Update payment status
         payment['status'] = 'completed' if result else 'failed'
@@ -193,21 +209,46 @@ class PaymentFactory:
 
     def _process_credit_card(self, payment: Dict[str, Any]) -> bool:
         # Bug: Processing in factory
-        return random.random() > 0.1
+        return self._rng.random() > 0.1
 
     def _process_paypal(self, payment: Dict[str, Any]) -> bool:
         # Bug: Processing in factory
-        return random.random() > 0.1
+        return self._rng.random() > 0.1
 
     def _process_bank_transfer(self, payment: Dict[str, Any]) -> bool:
         # Bug: Processing in factory
-        return random.random() > 0.1
+        return self._rng.random() > 0.1
+
+    def process_batch(self, payments: List[Dict[str, Any]]) -> List[bool]:
+        # Draw every failure decision in one vectorized call
+        import numpy as np
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        return (rng.random(len(payments)) > 0.1).tolist()
+
+    # Bug: Factory with too many responsibilities
+    payment_methods = {
+        'credit_card': _create_credit_card_payment,
+        'paypal': _create_paypal_payment,
+        'bank_transfer': _create_bank_transfer_payment
+    }
+    validation_rules = {
+        'credit_card': _validate_credit_card,
+        'paypal': _validate_paypal,
+        'bank_transfer': _validate_bank_transfer
+    }
+    processing_rules = {
+        'credit_card': _process_credit_card,
+        'paypal': _process_paypal,
+        'bank_transfer': _process_bank_transfer
+    }
 
 # Bug: Observer Pattern Misuse - Tight coupling and memory leaks
 class EventManager:
     """
     Observer Pattern Misuse: Tight coupling and memory leaks.
     """
+    __slots__ = ('observers', 'events')
+
     def __init__(self):
         # Bug: No unsubscribe mechanism
         self.observers = []
@@ -220,38 +261,46 @@ class EventManager:
     def notify_observers(self, event: Dict[str, Any]) -> None:
         # Bug: Direct observer calls
         self.events.append(event)
-        for observer in self.observers:
-            observer.update(event)
+        # Drive the fan-out from C: map() + a zero-length deque consumer
+        collections.deque(map(methodcaller('update', event), self.observers), maxlen=0)
 
     def process_event(self, event: Dict[str, Any]) -> None:
         # Bug: Mixed event processing and notification
-        # Process event
-        event['processed_at'] = datetime.now().isoformat()
-        event['status'] = 'processed'
+        # Process event into a new dict; the caller's event is left untouched
+        ts = datetime.now().isoformat()
+        processed = {**event, 'processed_at': ts, 'status': 'processed'}
 
         # Notify observers
-        self.notify_observers(event)
+        self.notify_observers(processed)
 
         # Store event
-        self.events.append(event)
+        self.events.append(processed)
 
 # Bug: Strategy Pattern Misuse - Mixed strategy and state
 class SortingStrategy:
     """
     Strategy Pattern Misuse: Mixed strategy and state.
     """
-    def __init__(self):
+    __slots__ = ('current_strategy', 'data', 'sorted_data', 'comparison_count',
+                 'swap_count', '_instrumented')
+
+    def __init__(self, instrumented: bool = False):
         # Bug: Mixed strategy and state
         self.current_strategy = None
         self.data = []
         self.sorted_data = []
         self.comparison_count = 0
         self.swap_count = 0
+        # Pure-Python sorts (with counters) only run when instrumented
+        self._instrumented = instrumented
 
     def set_strategy(self, strategy: str) -> None:
         # Bug: Strategy selection mixed with state
         if strategy == 'bubble':
             self.current_strategy = self._bubble_sort
+        elif strategy == 'timsort' or (
+                strategy in ('quick', 'merge') and not self._instrumented):
+            self.current_strategy = self._timsort
         elif strategy == 'quick':
             self.current_strategy = self._quick_sort
         elif strategy == 'merge':
@@ -272,9 +321,14 @@ class SortingStrategy:
         self.sorted_data = self.current_strategy()
         return self.sorted_data
 
+    def _timsort(self) -> List[Any]:
+        # Built-in Timsort runs in C and returns a new list
+        return sorted(self.data)
+
     def _bubble_sort(self) -> List[Any]:
         # Bug: Strategy implementation mixed with state
-        data = self.data.copy()
+        # sort() already handed us a private copy
+        data = self.data
         n = len(data)
         for i in range(n):
             for j in range(0, n - i - 1):
@@ -284,9 +338,10 @@ class SortingStrategy:
                     self.swap_count += 1
         return data
 
-    def _quick_sort(self) -> List[Any]:
+    def _quick_sort(self, data: Optional[List[Any]] = None) -> List[Any]:
         # Bug: Strategy implementation mixed with state
-        data = self.data.copy()
+        if data is None:
+            data = self.data
         if len(data) <= 1:
             return data
 
@@ -299,9 +354,10 @@ class SortingStrategy:
         return (self._quick_sort(left) + middle +
                 self._quick_sort(right))
 
-    def _merge_sort(self) -> List[Any]:
+    def _merge_sort(self, data: Optional[List[Any]] = None) -> List[Any]:
         # Bug: Strategy implementation mixed with state
-        data = self.data.copy()
+        if data is None:
+            data = self.data
         if len(data) <= 1:
             return data
 
@@ -333,39 +389,53 @@ class LoggingDecorator:
     """
     Decorator Pattern Misuse: Violation of Liskov Substitution.
     """
+    __slots__ = ('component', 'logs', 'observability_hook')
+
     def __init__(self, component: Any):
         # Bug: Direct component reference
         self.component = component
-        self.logs = []
+        # Bounded ring buffer so long-running decorators do not leak memory
+        self.logs = collections.deque(maxlen=LOG_CAP)
+        # Optional callable(result, finished_at) for timing/metrics
+        self.observability_hook: Optional[Callable[[Dict[str, Any], float], None]] = None
 
     def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Changed behavior of decorated component
+        # Structured entries are only built when DEBUG logging is enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
             # Log before processing
-            self.logs.append({
-                'timestamp': datetime.now().isoformat(),
-                'action': 'start',
-                'data': data
-            })
+            logger.debug('start %r', data)
+            if debug:
+                self.logs.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'action': 'start',
+                    'data': data
+                })
 
             # Process data
             result = self.component.process(data)
 
             # Log after processing
-            self.logs.append({
-                'timestamp': datetime.now().isoformat(),
-                'action': 'end',
-                'data': result
-            })
+            logger.debug('end %r', result)
+            if debug:
+                self.logs.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'action': 'end',
+                    'data': result
+                })
 
             # Bug: Additional behavior not in original component
             result['processed_at'] = datetime.now().isoformat()
-            result['processing_time'] = time.time()
+
+            if self.observability_hook is not None:
+                self.observability_hook(result, time.time())
 
             return result
 
         except Exception as e:
             # Bug: Changed error handling
+            logger.debug('error %s', e)
             self.logs.append({
                 'timestamp': datetime.now().isoformat(),
                 'action': 'error',
@@ -378,6 +448,8 @@ class CommandProcessor:
     """
     Command Pattern Misuse: Mixed command and state.
     """
+    __slots__ = ('commands', 'current_state', 'history', 'undo_stack')
+
     def __init__(self):
         # Bug: Mixed command and state
         self.commands = []
@@ -387,14 +459,15 @@ class CommandProcessor:
 
     def execute_command(self, command: Dict[str, Any]) -> None:
         # Bug: Mixed command execution and state management
-        if command['type'] == 'create':
+        command_type = sys.intern(command['type'])
+        if command_type == 'create':
             self._execute_create(command)
-        elif command['type'] == 'update':
+        elif command_type == 'update':
             self._execute_update(command)
-        elif command['type'] == 'delete':
+        elif command_type == 'delete':
             self._execute_delete(command)
         else:
-            raise ValueError(f"Unsupported command type: {command['type']}")
+            raise ValueError(f"Unsupported command type: {command_type}")
 
         # Update state
         self.current_state = self._compute_state()
@@ -48,143 +48,387 @@ The task is to identify and fix the following API design issues:
 Review the code and identify these API design issues.
 """
 
-import json
+import asyncio
 import time
 import random
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Iterator
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from pathlib import Path
 import re
 import hashlib
-from enum import Enum
+import hmac
+from enum import Enum, IntEnum
 import sqlite3
 import os
+import sys
+import threading
+import uuid
 import requests
 import redis
+import redis.asyncio
 import jwt
+import msgpack
+import numpy as np
+import orjson
 from abc import ABC, abstractmethod
+from cachetools import TTLCache
+from operator import itemgetter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sliding-window log evaluated atomically inside Redis: one round-trip per check.
+# KEYS[1] = sorted-set key; ARGV = limit, window_ms, now_ms, request member.
+# Returns {1, remaining} when allowed, {0, retry_after_ms} otherwise.
+_SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+local count = redis.call('ZCARD', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], window)
+if count > limit then
+    redis.call('ZREM', KEYS[1], ARGV[4])
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local retry = window
+    if oldest[2] then
+        retry = window - (now - tonumber(oldest[2]))
+    end
+    return {0, retry}
+end
+return {1, limit - count}
+"""
+
+# Compare-and-delete: releases a lock only if it still holds the caller's
+# token, so a lock that expired and was re-acquired is left alone.
+# KEYS[1] = lock key; ARGV[1] = token.
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Rate limit window for the per-plan limits in PublicAPI (milliseconds)
+RATE_LIMIT_WINDOW_MS = 3600 * 1000
+# api_key -> plan caching in PublicAPI: in-process L1, then Redis (seconds)
+PLAN_L1_SIZE = 100_000
+PLAN_L1_TTL = 60
+PLAN_CACHE_TTL = 300
+
+# Connection tuning applied to every SQLite database used below
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+)
+SQLITE_STATEMENT_CACHE_SIZE = 256
+
+
+def _connect(path: str, read_only: bool = False) -> sqlite3.Connection:
+    # sqlite3 keeps an LRU of compiled statements keyed by the SQL text,
+    # so repeated execute() calls with the same query skip re-parsing.
+    # Each connection keeps a private cache: under WAL, read-only handles
+    # see committed data without taking locks that would stall writers.
+    mode = 'ro' if read_only else 'rwc'
+    conn = sqlite3.connect(f'file:{path}?mode={mode}', uri=True,
+                           check_same_thread=False,
+                           cached_statements=SQLITE_STATEMENT_CACHE_SIZE)
+    for pragma in SQLITE_PRAGMAS:
+        # journal_mode is a property of the database file; only writers set it
+        if read_only and pragma.startswith('PRAGMA journal_mode'):
+            continue
+        conn.execute(pragma)
+    return conn
+
+# One process-wide connection per database file for the single-connection APIs
+_CONNS: Dict[str, sqlite3.Connection] = {}
+_CONNS_LOCK = threading.Lock()
+
+
+def _shared_connection(path: str) -> sqlite3.Connection:
+    with _CONNS_LOCK:
+        conn = _CONNS.get(path)
+        if conn is None:
+            conn = _CONNS[path] = _connect(path)
+        return conn
+
+class _ThreadLocalConnection:
+    """Per-thread SQLite connection that proxies the sqlite3.Connection API."""
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = _connect(self.path, self.read_only)
+            self._local.conn = conn
+        return conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+# Pre-initialised hasher; copy() skips constructor setup per password
+_SHA256 = hashlib.sha256()
+
+
+def _hash_password(password: str) -> str:
+    h = _SHA256.copy()
+    h.update(password.encode())
+    return h.hexdigest()
+
+def _redis_client() -> 'redis.asyncio.Redis':
+    # Non-blocking client: many requests can wait on Redis from one event loop
+    return redis.asyncio.Redis(host='localhost', port=6379, db=0,
+                               decode_responses=True, max_connections=50)
+
+# (status, headers, body) returned by the GET endpoints
+HTTPResponse = Tuple[int, Dict[str, str], bytes]
+
+
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    # Canonical encoding so equal payloads always hash to the same ETag
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+
+def _http_response(body: bytes, if_none_match: Optional[str] = None,
+                   last_modified: Optional[str] = None) -> HTTPResponse:
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {'ETag': etag}
+    if last_modified:
+        headers['Last-Modified'] = str(last_modified)
+    if if_none_match == etag:
+        return 304, headers, b''
+    return 200, headers, body
+
+
+def _error_response(status: int, message: str) -> HTTPResponse:
+    return status, {}, _json_body({'error': message})
+
+# UserAPI read cache settings (seconds)
+USER_CACHE_TTL = 300
+USER_CACHE_LOCK_TTL = 5
+USER_CACHE_LOCK_WAIT = 0.05
+
+
+def _user_cache_key(user_id: str) -> str:
+    return f"v1:user:{user_id}"
+
 # Bug: Inconsistent Interface Design
 class UserAPI:
     """
     Inconsistent Interface Design: Mixed naming and response patterns.
     """
     def __init__(self):
-        self.db = sqlite3.connect('users.db')
-        self.cache = redis.Redis(host='localhost', port=6379, db=0)
+        self.db = _ThreadLocalConnection('users.db')
+        # Read-only handle for lookups so they never contend with writers
+        self.reader = _ThreadLocalConnection('users.db', read_only=True)
+        self.cache = _redis_client()
+        self._release_lock = self.cache.register_script(_RELEASE_LOCK_LUA)
 
     # Bug: Inconsistent method naming
-    def get_user(self, user_id: str) -> Dict[str, Any]:
+    async def get_user(self, user_id: str,
+                       if_none_match: Optional[str] = None) -> HTTPResponse:
         # Bug: Inconsistent response format
+        # Cache-aside: serve from Redis, fall through to SQLite on a miss
+        key = _user_cache_key(user_id)
+        lock_key = f"{key}:lock"
+        # Set only while this caller owns the rebuild lock
+        token = None
         try:
-            cursor = self.db.execute(
-                'SELECT * FROM users WHERE id = ?',
-                (user_id,)
-            )
-            user = cursor.fetchone()
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return _http_response(cached.encode(), if_none_match)
+
+            # Only one caller rebuilds a missing key; others wait briefly
+            # for it to be repopulated before hitting SQLite themselves
+            token = uuid.uuid4().hex
+            if not await self.cache.set(lock_key, token, nx=True,
+                                        ex=USER_CACHE_LOCK_TTL):
+                token = None
+                await asyncio.sleep(USER_CACHE_LOCK_WAIT)
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    return _http_response(cached.encode(), if_none_match)
+        except redis.RedisError as e:
+            token = None
+            logger.warning(f"User cache unavailable: {e}")
+
+        try:
+            user = await asyncio.to_thread(self._fetch_user, user_id)
             if user:
-                return {
+                body = _json_body({
                     'user': {
                         'id': user[0],
                         'name': user[1],
                         'email': user[2]
                     }
-                }
-            return {'error': 'User not found'}
+                })
+                await self._cache_user(key, body)
+                return _http_response(body, if_none_match)
+            return _error_response(404, 'User not found')
         except Exception as e:
-            return {'error': str(e)}
+            return _error_response(500, str(e))
+        finally:
+            # Released on every outcome (hit, 404, error), never on behalf
+            # of another caller
+            if token is not None:
+                await self._unlock(lock_key, token)
+
+    # sqlite3 blocks, so every query runs on a worker thread (each with its
+    # own thread-local connection) rather than on the event loop
+    def _fetch_user(self, user_id: str) -> Optional[Tuple[Any, ...]]:
+        cursor = self.reader.execute(
+            'SELECT * FROM users WHERE id = ?',
+            (user_id,)
+        )
+        return cursor.fetchone()
+
+    def _write(self, sql: str, params: Tuple[Any, ...]) -> None:
+        self.db.execute(sql, params)
+        self.db.commit()
+
+    async def _cache_user(self, key: str, body: bytes) -> None:
+        try:
+            await self.cache.set(key, body, ex=USER_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"User cache unavailable: {e}")
+
+    async def _unlock(self, lock_key: str, token: str) -> None:
+        try:
+            await self._release_lock(keys=[lock_key], args=[token])
+        except redis.RedisError as e:
+            logger.warning(f"User cache unavailable: {e}")
+
+    async def _invalidate_user(self, user_id: str) -> None:
+        try:
+            await self.cache.delete(_user_cache_key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"User cache unavailable: {e}")
 
     # Bug: Inconsistent method naming
-    def createNewUser(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def createNewUser(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Inconsistent response format
         try:
-            self.db.execute('''
+            await asyncio.to_thread(self._write, '''
                 INSERT INTO users (name, email, password)
                 VALUES (?, ?, ?)
             ''', (user_data['name'], user_data['email'],
-                  hashlib.sha256(user_data['password'].encode()).hexdigest()))
-            self.db.commit()
+                  _hash_password(user_data['password'])))
             return {'status': 'success', 'message': 'User created'}
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
 
     # Bug: Inconsistent method naming
-    def update_user_info(self, user_id: str,
-                        data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_user_info(self, user_id: str,
+                               data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Inconsistent response format
         try:
-            self.db.execute('''
+            await asyncio.to_thread(self._write, '''
                 UPDATE users SET name = ?, email = ?
                 WHERE id = ?
             ''', (data['name'], data['email'], user_id))
-            self.db.commit()
+            await self._invalidate_user(user_id)
             return {'result': 'updated'}
         except Exception as e:
             return {'result': 'failed', 'reason': str(e)}
 
     # Bug: Inconsistent method naming
-    def removeUser(self, user_id: str) -> Dict[str, Any]:
+    async def removeUser(self, user_id: str) -> Dict[str, Any]:
         # Bug: Inconsistent response format
         try:
-            self.db.execute('DELETE FROM users WHERE id = ?', (user_id,))
-            self.db.commit()
+            await asyncio.to_thread(self._write,
+                                    'DELETE FROM users WHERE id = ?', (user_id,))
+            await self._invalidate_user(user_id)
             return {'deleted': True}
         except Exception as e:
             return {'deleted': False, 'error': str(e)}
 
+class PaymentError(IntEnum):
+    MISSING_AMOUNT = 1001
+    MISSING_CURRENCY = 1002
+    MISSING_CARD_NUMBER = 1003
+    AMOUNT_TOO_HIGH = 1004
+    TRANSACTION_FAILED = 1005
+    INVALID_CARD_NUMBER = 1006
+
+PAYMENT_ERROR_MESSAGES = {
+    PaymentError.MISSING_AMOUNT: 'Missing amount',
+    PaymentError.MISSING_CURRENCY: 'Missing currency',
+    PaymentError.MISSING_CARD_NUMBER: 'Missing card number',
+    PaymentError.AMOUNT_TOO_HIGH: 'Amount too high',
+    PaymentError.TRANSACTION_FAILED: 'Transaction failed',
+    PaymentError.INVALID_CARD_NUMBER: 'Invalid card number',
+}
+
+PAYMENT_REQUIRED_FIELDS = (
+    ('amount', PaymentError.MISSING_AMOUNT),
+    ('currency', PaymentError.MISSING_CURRENCY),
+    ('card_number', PaymentError.MISSING_CARD_NUMBER),
+)
+PAYMENT_REQUIRED_KEYS = frozenset(field for field, _ in PAYMENT_REQUIRED_FIELDS)
+
+_CARD_RE = re.compile(r'^\d{13,19}$')
+
 # Bug: Poor Error Handling
 class PaymentAPI:
     """
     Poor Error Handling: Generic errors and inconsistent formats.
     """
     def __init__(self):
-        self.db = sqlite3.connect('payments.db')
+        self.db = _shared_connection('payments.db')
 
     def process_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Generic error handling
+        # Expected failures come back as error codes, not exceptions
         try:
-            if not self._validate_payment(payment_data):
-                return {'error': 'Invalid payment data'}
-
-            if not self._check_balance(payment_data):
-                return {'error': 'Insufficient funds'}
-
-            if not self._process_transaction(payment_data):
-                return {'error': 'Transaction failed'}
-
+            code = (self._validate_payment(payment_data)
+                    or self._check_balance(payment_data)
+                    or self._process_transaction(payment_data))
+            if code is not None:
+                return {'error_code': int(code),
+                        'message': PAYMENT_ERROR_MESSAGES[code]}
             return {'status': 'success'}
 
         except Exception as e:
             # Bug: Generic error response
             return {'error': str(e)}
 
-    def _validate_payment(self, data: Dict[str, Any]) -> bool:
-        # Bug: No specific error codes
-        if 'amount' not in data:
-            raise Exception('Missing amount')
-        if 'currency' not in data:
-            raise Exception('Missing currency')
-        if 'card_number' not in data:
-            raise Exception('Missing card number')
-        return True
-
-    def _check_balance(self, data: Dict[str, Any]) -> bool:
-        # Bug: No specific error codes
+    def _validate_payment(self, data: Dict[str, Any]) -> Optional['PaymentError']:
+        if not PAYMENT_REQUIRED_KEYS <= data.keys():
+            # First missing field, in declaration order
+            return next(code for field, code in PAYMENT_REQUIRED_FIELDS
+                        if field not in data)
+        if not _CARD_RE.match(str(data['card_number'])):
+            return PaymentError.INVALID_CARD_NUMBER
+        return None
+
+    def _check_balance(self, data: Dict[str, Any]) -> Optional['PaymentError']:
         if data['amount'] > 1000:
-            raise Exception('Amount too high')
-        return True
+            return PaymentError.AMOUNT_TOO_HIGH
+        return None
 
-    def _process_transaction(self, data: Dict[str, Any]) -> bool:
-        # Bug: No specific error codes
+    def _process_transaction(self, data: Dict[str, Any]) -> Optional['PaymentError']:
         if random.random() < 0.1:
-            raise Exception('Transaction failed')
-        return True
+            return PaymentError.TRANSACTION_FAILED
+        return None
+
+PRODUCT_INSERT_SQL_V1 = sys.intern('''
+    INSERT INTO products (name, price, description)
+    VALUES (?, ?, ?)
+''')
+PRODUCT_INSERT_SQL_V2 = sys.intern('''
+    INSERT INTO products (name, price, description, category,
+                          stock, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+''')
 
 # Bug: Versioning Issues
 class ProductAPI:
@@ -192,22 +436,39 @@ class ProductAPI:
     Versioning Issues: No versioning strategy and breaking changes.
     """
     def __init__(self):
-        self.db = sqlite3.connect('products.db')
+        self.db = _ThreadLocalConnection('products.db')
+        # Read-only handle for lookups so they never contend with writers
+        self.reader = _ThreadLocalConnection('products.db', read_only=True)
         # Bug: Mixed API versions
         self.v1_products = {}
         self.v2_products = {}
+        self._writers = {
+            'v1': self._make_writer(
+                PRODUCT_INSERT_SQL_V1,
+                itemgetter('name', 'price', 'description'),
+                {'status': 'created'}
+            ),
+            'v2': self._make_writer(
+                PRODUCT_INSERT_SQL_V2,
+                lambda d: (d['name'], d['price'], d['description'],
+                           d['category'], d['stock'],
+                           orjson.dumps(d.get('metadata', {})).decode()),
+                {'status': 'created', 'version': 'v2'}
+            ),
+        }
 
-    def get_product(self, product_id: str) -> Dict[str, Any]:
+    def get_product(self, product_id: str,
+                    if_none_match: Optional[str] = None) -> HTTPResponse:
         # Bug: No versioning in API
         try:
-            cursor = self.db.execute(
+            cursor = self.reader.execute(
                 'SELECT * FROM products WHERE id = ?',
                 (product_id,)
             )
             product = cursor.fetchone()
             if product:
                 # Bug: Breaking changes in response format
-                return {
+                body = _json_body({
                     'id': product[0],
                     'name': product[1],
                     'price': product[2],
@@ -216,42 +477,51 @@ class ProductAPI:
                     'stock': product[5],
                     'created_at': product[6],
                     'updated_at': product[7],
-                    'metadata': json.loads(product[8]) if product[8] else {}
-                }
-            return {'error': 'Product not found'}
+                    'metadata': orjson.loads(product[8]) if product[8] else {}
+                })
+                return _http_response(body, if_none_match,
+                                      last_modified=product[7])
+            return _error_response(404, 'Product not found')
         except Exception as e:
-            return {'error': str(e)}
+            return _error_response(500, str(e))
 
     def create_product(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Breaking changes in parameters
         try:
             # Bug: Mixed version handling
-            if 'version' in product_data and product_data['version'] == 'v2':
-                return self._create_product_v2(product_data)
-            return self._create_product_v1(product_data)
+            writer = self._writers.get(product_data.get('version'),
+                                       self._writers['v1'])
+            return writer(product_data)
         except Exception as e:
             return {'error': str(e)}
 
-    def _create_product_v1(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        # Bug: Old version with breaking changes
-        self.db.execute('''
-            INSERT INTO products (name, price, description)
-            VALUES (?, ?, ?)
-        ''', (data['name'], data['price'], data['description']))
-        self.db.commit()
-        return {'status': 'created'}
-
-    def _create_product_v2(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        # Bug: New version with different structure
-        self.db.execute('''
-            INSERT INTO products (name, price, description, category,
-                                stock, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (data['name'], data['price'], data['description'],
-              data['category'], data['stock'],
-              json.dumps(data.get('metadata', {}))))
-        self.db.commit()
-        return {'status': 'created', 'version': 'v2'}
+    def _make_writer(self, sql: str,
+                     extract: Callable[[Dict[str, Any]], tuple],
+                     response: Dict[str, Any]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        # Specialised per-version writer with SQL and columns bound up front
+        db = self.db
+
+        def write(data: Dict[str, Any]) -> Dict[str, Any]:
+            db.execute(sql, extract(data))
+            db.commit()
+            return dict(response)
+        return write
+
+def _pack_items(items: List[Any]) -> bytes:
+    # Order items are stored as msgpack BLOBs
+    return msgpack.packb(items, use_bin_type=True)
+
+
+def _unpack_items(raw: Union[bytes, str]) -> List[Any]:
+    # Rows written before the msgpack switch still hold JSON text
+    if isinstance(raw, bytes):
+        return msgpack.unpackb(raw, raw=False)
+    return orjson.loads(raw)
+
+ORDER_INSERT_SQL = '''
+    INSERT INTO orders (customer_id, items, total, status)
+    VALUES (?, ?, ?, ?)
+'''
 
 # Bug: Resource Naming Issues
 class OrderAPI:
@@ -259,10 +529,11 @@ class OrderAPI:
     Resource Naming Issues: Inconsistent naming and poor URL structure.
     """
     def __init__(self):
-        self.db = sqlite3.connect('orders.db')
+        self.db = _ThreadLocalConnection('orders.db')
 
     # Bug: Inconsistent resource naming
-    def getOrder(self, order_id: str) -> Dict[str, Any]:
+    def getOrder(self, order_id: str,
+                 if_none_match: Optional[str] = None) -> HTTPResponse:
         # Bug: Inconsistent method naming
         try:
             cursor = self.db.execute(
@@ -271,33 +542,47 @@ class OrderAPI:
             )
             order = cursor.fetchone()
             if order:
-                return {
+                body = _json_body({
                     'order_id': order[0],  # Bug: Inconsistent field naming
                     'customer': order[1],  # Bug: Inconsistent field naming
-                    'items': json.loads(order[2]),
+                    'items': _unpack_items(order[2]),
                     'total': order[3],
                     'status': order[4]
-                }
-            return {'error': 'Order not found'}
+                })
+                return _http_response(body, if_none_match)
+            return _error_response(404, 'Order not found')
         except Exception as e:
-            return {'error': str(e)}
+            return _error_response(500, str(e))
 
     # Bug: Inconsistent resource naming
     def create_new_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Inconsistent method naming
         try:
-            self.db.execute('''
-                INSERT INTO orders (customer_id, items, total, status)
-                VALUES (?, ?, ?, ?)
-            ''', (order_data['customer_id'],
-                  json.dumps(order_data['items']),
-                  order_data['total'],
-                  'pending'))
+            self.db.execute(ORDER_INSERT_SQL, (
+                order_data['customer_id'],
+                _pack_items(order_data['items']),
+                order_data['total'],
+                'pending'
+            ))
             self.db.commit()
             return {'order_created': True}  # Bug: Inconsistent response naming
         except Exception as e:
             return {'order_created': False, 'error': str(e)}
 
+    def bulk_create_orders(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # One executemany and one commit for the whole batch
+        try:
+            self.db.executemany(ORDER_INSERT_SQL, [
+                (o['customer_id'], _pack_items(o['items']),
+                 o['total'], 'pending')
+                for o in orders
+            ])
+            self.db.commit()
+            return {'orders_created': len(orders)}
+        except Exception as e:
+            self.db.rollback()
+            return {'orders_created': 0, 'error': str(e)}
+
     # Bug: Inconsistent resource naming
     def updateOrderStatus(self, order_id: str,
                          status: str) -> Dict[str, Any]:
@@ -311,15 +596,34 @@ class OrderAPI:
         except Exception as e:
             return {'status_updated': False, 'error': str(e)}
 
+# Verified-token memo in SecureAPI; TTL (seconds) well under token lifetime
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL = 60
+
+# Redis SET holding sha256 digests of every valid API key
+AUTH_KEYS_SET = 'auth:keys:valid'
+
+
+def _api_key_digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode()).digest()
+
 # Bug: Authentication Issues
 class SecureAPI:
     """
     Authentication Issues: Inconsistent auth methods and poor token handling.
     """
     def __init__(self):
-        self.db = sqlite3.connect('auth.db')
+        self.db = _shared_connection('auth.db')
         self.secret_key = 'your-secret-key'  # Bug: Hardcoded secret
         self.token_expiry = 3600  # Bug: Hardcoded expiry
+        # Codec and key bytes are built once rather than on every call
+        self._jwt = jwt.PyJWT()
+        self._key_bytes = self.secret_key.encode()
+        self._decode_options = {'require': ['exp']}
+        self._alg_opts = {'algorithm': 'HS256'}
+        self._tok_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+        self._tok_cache_ver = 0
+        self.cache = redis.Redis(host='localhost', port=6379, db=0)
 
     def authenticate(self, credentials: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Mixed authentication methods
@@ -340,22 +644,53 @@ class SecureAPI:
 
     def _authenticate_api_key(self, api_key: str) -> Dict[str, Any]:
         # Bug: Inconsistent auth method
+        # Valid keys are mirrored into a Redis SET as sha256 digests; SQLite
+        # is only consulted on a miss (e.g. a key issued since the last sync)
+        digest = _api_key_digest(api_key)
+        try:
+            if self.cache.sismember(AUTH_KEYS_SET, digest):
+                return {'authenticated': True, 'method': 'api_key'}
+        except redis.RedisError as e:
+            logger.warning(f"Auth cache unavailable: {e}")
+
         cursor = self.db.execute(
-            'SELECT * FROM api_keys WHERE key = ?',
+            'SELECT 1 FROM api_keys WHERE key = ?',
             (api_key,)
         )
         if cursor.fetchone():
+            try:
+                self.cache.sadd(AUTH_KEYS_SET, digest)
+            except redis.RedisError as e:
+                logger.warning(f"Auth cache unavailable: {e}")
             return {'authenticated': True, 'method': 'api_key'}
         return {'authenticated': False, 'error': 'Invalid API key'}
 
+    def sync_api_keys(self) -> int:
+        # Rebuild the Redis mirror from SQLite; returns the number of keys
+        keys = [_api_key_digest(row[0]) for row in
+                self.db.execute('SELECT key FROM api_keys')]
+        with self.cache.pipeline() as pipe:
+            pipe.delete(AUTH_KEYS_SET)
+            if keys:
+                pipe.sadd(AUTH_KEYS_SET, *keys)
+            pipe.execute()
+        return len(keys)
+
+    def revoke_api_key(self, api_key: str) -> None:
+        self.db.execute('DELETE FROM api_keys WHERE key = ?', (api_key,))
+        self.db.commit()
+        self.cache.srem(AUTH_KEYS_SET, _api_key_digest(api_key))
+
     def _authenticate_password(self, username: str,
                              password: str) -> Dict[str, Any]:
         # Bug: Inconsistent auth method
+        # Compare in constant time instead of matching the hash in SQL
         cursor = self.db.execute(
-            'SELECT * FROM users WHERE username = ? AND password = ?',
-            (username, hashlib.sha256(password.encode()).hexdigest())
+            'SELECT password FROM users WHERE username = ?',
+            (username,)
         )
-        if cursor.fetchone():
+        row = cursor.fetchone()
+        if row and hmac.compare_digest(row[0], _hash_password(password)):
             token = self._generate_token(username)
             return {
                 'authenticated': True,
@@ -366,8 +701,22 @@ class SecureAPI:
 
     def _authenticate_token(self, token: str) -> Dict[str, Any]:
         # Bug: Inconsistent auth method
+        # Verified payloads are memoised for a short TTL; the cache key
+        # carries the secret version so rotation invalidates every entry
+        cache_key = (self._tok_cache_ver,
+                     hashlib.blake2b(token.encode(), digest_size=16).digest())
+        payload = self._tok_cache.get(cache_key)
+        if payload is not None and payload['exp'] > time.time():
+            return {
+                'authenticated': True,
+                'method': 'token',
+                'user': payload['user']
+            }
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
+            payload = self._jwt.decode(token, self._key_bytes,
+                                       algorithms=['HS256'],
+                                       options=self._decode_options)
+            self._tok_cache[cache_key] = payload
             return {
                 'authenticated': True,
                 'method': 'token',
@@ -378,13 +727,21 @@ class SecureAPI:
         except jwt.InvalidTokenError:
             return {'authenticated': False, 'error': 'Invalid token'}
 
+    def rotate_secret(self, secret_key: str) -> None:
+        self.secret_key = secret_key
+        self._key_bytes = secret_key.encode()
+        self._tok_cache_ver += 1
+
     def _generate_token(self, username: str) -> str:
         # Bug: Poor token handling
         payload = {
             'user': username,
-            'exp': datetime.utcnow() + timedelta(seconds=self.token_expiry)
+            'exp': int(time.time()) + self.token_expiry
         }
-        return jwt.encode(payload, self.secret_key, algorithm='HS256')
+        return self._jwt.encode(payload, self._key_bytes, **self._alg_opts)
+
+# Rows per fetchmany() call when DataAPI streams results
+DATA_FETCH_SIZE = 1000
 
 # Bug: Response Format Issues
 class DataAPI:
@@ -392,12 +749,19 @@ class DataAPI:
     Response Format Issues: Inconsistent response structures.
     """
     def __init__(self):
-        self.db = sqlite3.connect('data.db')
+        self.db = _shared_connection('data.db')
+        try:
+            self.db.execute('CREATE INDEX IF NOT EXISTS idx_data_id ON data(id)')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not index data table: {e}")
 
     def get_data(self, query: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Inconsistent response format
         try:
             cursor = self.db.execute(query['sql'], query.get('params', ()))
+            cursor.arraysize = DATA_FETCH_SIZE
+            if query.get('stream'):
+                return self._stream_rows(cursor, query.get('format'))
             data = cursor.fetchall()
 
             # Bug: Mixed response formats
@@ -412,6 +776,14 @@ class DataAPI:
                 }
             elif query.get('format') == 'simple':
                 return {'results': data}
+            elif query.get('format') == 'columnar':
+                # Column-major layout: each column name is sent once
+                columns = [d[0] for d in cursor.description]
+                return {
+                    'columns': columns,
+                    'data': ([list(col) for col in zip(*data)] if data
+                             else [[] for _ in columns])
+                }
             else:
                 return data  # Bug: Inconsistent return type
 
@@ -419,21 +791,34 @@ class DataAPI:
             # Bug: Inconsistent error format
             return {'error': str(e)}
 
-    def get_paginated_data(self, page: int,
+    def _stream_rows(self, cursor: sqlite3.Cursor,
+                     fmt: Optional[str]) -> Iterator[Any]:
+        # Yield fetchmany() chunks so only one chunk is held in memory;
+        # 'simple' chunks are pre-encoded as JSON arrays
+        while rows := cursor.fetchmany():
+            yield orjson.dumps(rows) if fmt == 'simple' else rows
+
+    def get_paginated_data(self, cursor: Optional[Any],
                           page_size: int) -> Dict[str, Any]:
-        # Bug: Poor pagination
+        # Keyset pagination: seek past the last id instead of OFFSET scans
         try:
-            offset = (page - 1) * page_size
-            cursor = self.db.execute('''
-                SELECT * FROM data LIMIT ? OFFSET ?
-            ''', (page_size, offset))
-            data = cursor.fetchall()
+            if cursor is None:
+                rows = self.db.execute(
+                    'SELECT * FROM data ORDER BY id LIMIT ?',
+                    (page_size,)
+                )
+            else:
+                rows = self.db.execute(
+                    'SELECT * FROM data WHERE id > ? ORDER BY id LIMIT ?',
+                    (cursor, page_size)
+                )
+            data = rows.fetchall()
 
             # Bug: Inconsistent pagination format
             return {
                 'data': data,
-                'page': page,
                 'size': page_size,
+                'next_cursor': data[-1][0] if data else None,
                 'has_more': len(data) == page_size
             }
 
@@ -445,6 +830,8 @@ class ServiceAPI:
     """
     Documentation Issues: Missing or incorrect documentation.
     """
+    _required = frozenset(('type', 'data'))
+
     def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Missing parameter documentation
         # Bug: Missing return value documentation
@@ -461,46 +848,61 @@ class ServiceAPI:
 
     def _validate_request(self, request: Dict[str, Any]) -> bool:
         # Bug: Missing documentation
-        return all(key in request for key in ['type', 'data'])
+        return self._required <= request.keys()
 
     def _process_data(self, request: Dict[str, Any]) -> Any:
         # Bug: Missing documentation
-        if request['type'] == 'transform':
-            return self._transform_data(request['data'])
-        elif request['type'] == 'filter':
-            return self._filter_data(request['data'])
-        else:
+        handler = self._handlers.get(request['type'])
+        if handler is None:
             raise ValueError(f"Unknown request type: {request['type']}")
+        return handler(self, request['data'])
 
     def _transform_data(self, data: Any) -> Any:
         # Bug: Missing documentation
+        if isinstance(data, (bytes, bytearray)):
+            return data.upper()
         return str(data).upper()
 
     def _filter_data(self, data: Any) -> Any:
         # Bug: Missing documentation
+        # Arrays are masked in place; converting a list to an array and back
+        # costs more than the comprehension saves
+        if isinstance(data, np.ndarray):
+            return data[data > 0]
         return [x for x in data if x > 0]
 
+    # Request type -> handler (unbound), built once with the class
+    _handlers = {
+        'transform': _transform_data,
+        'filter': _filter_data,
+    }
+
 # Bug: Rate Limiting Issues
 class PublicAPI:
     """
     Rate Limiting Issues: No rate limiting and inconsistent limits.
     """
     def __init__(self):
-        self.db = sqlite3.connect('api.db')
-        self.cache = redis.Redis(host='localhost', port=6379, db=0)
+        self.db = _shared_connection('api.db')
+        self.cache = _redis_client()
         # Bug: Inconsistent rate limits
         self.rate_limits = {
             'free': 100,  # requests per hour
             'basic': 1000,
             'premium': 10000
         }
+        # Script is sent once and then invoked via EVALSHA
+        self._sliding_window = self.cache.register_script(_SLIDING_WINDOW_LUA)
+        self._plan_l1 = TTLCache(maxsize=PLAN_L1_SIZE, ttl=PLAN_L1_TTL)
 
-    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: No rate limiting
         try:
             # Bug: Inconsistent limit checking
-            if not self._check_rate_limit(request['api_key']):
-                return {'error': 'Rate limit exceeded'}
+            rate = await self._check_rate_limit(request['api_key'])
+            if not rate['allowed']:
+                return {'error': 'Rate limit exceeded',
+                        'retry_after': rate['retry_after']}
 
             result = self._process_request(request)
             return {'result': result}
@@ -508,49 +910,66 @@ class PublicAPI:
         except Exception as e:
             return {'error': str(e)}
 
-    def _check_rate_limit(self, api_key: str) -> bool:
+    async def _check_rate_limit(self, api_key: str) -> Dict[str, Any]:
         # Bug: Poor rate limit implementation
         try:
-            # Bug: Inconsistent limit storage
-            count = self.cache.get(f"rate_limit:{api_key}")
-            if count is None:
-                self.cache.setex(f"rate_limit:{api_key}", 3600, 1)
-                return True
-
-            count = int(count)
-            limit = self._get_rate_limit(api_key)
-
-            if count >= limit:
-                return False
-
-            self.cache.incr(f"rate_limit:{api_key}")
-            return True
+            limit = await self._get_rate_limit(api_key)
+            allowed, value = await self._sliding_window(
+                keys=[f"rl:z:{api_key}"],
+                args=[limit, RATE_LIMIT_WINDOW_MS,
+                      int(time.time() * 1000), uuid.uuid4().hex]
+            )
+            if allowed:
+                return {'allowed': True, 'retry_after': 0}
+            return {'allowed': False, 'retry_after': int(value)}
 
         except Exception:
-            return True  # Bug: Fail open
+            return {'allowed': True, 'retry_after': 0}  # Bug: Fail open
 
-    def _get_rate_limit(self, api_key: str) -> int:
+    async def _get_rate_limit(self, api_key: str) -> int:
         # Bug: Inconsistent limit retrieval
+        return self.rate_limits.get(await self._get_plan(api_key), 100)
+
+    async def _get_plan(self, api_key: str) -> str:
+        # L1 in-process cache, then Redis, then SQLite
+        try:
+            return self._plan_l1[api_key]
+        except KeyError:
+            pass
+
+        plan = await self.cache.get(f"plan:{api_key}")
+        if plan is None:
+            plan = await asyncio.to_thread(self._load_plan, api_key)
+            await self.cache.set(f"plan:{api_key}", plan, ex=PLAN_CACHE_TTL)
+        self._plan_l1[api_key] = plan
+        return plan
+
+    def _load_plan(self, api_key: str) -> str:
         cursor = self.db.execute(
             'SELECT plan FROM api_keys WHERE key = ?',
             (api_key,)
         )
         plan = cursor.fetchone()
-        return self.rate_limits.get(plan[0] if plan else 'free', 100)
+        return plan[0] if plan else 'free'
+
+    async def invalidate_plan(self, api_key: str) -> None:
+        # Call after an api_key changes plan
+        self._plan_l1.pop(api_key, None)
+        await self.cache.delete(f"plan:{api_key}")
 
 def main():
     # Test Inconsistent Interface Design
     print("Testing Inconsistent Interface Design:")
     user_api = UserAPI()
     try:
-        user = user_api.get_user('user1')
+        user = asyncio.run(user_api.get_user('user1'))
         print(f"Got user: {user}")
 
-        result = user_api.createNewUser({
+        result = asyncio.run(user_api.createNewUser({
             'name': 'John Doe',
             'email': 'john@example.com',
             'password': 'password123'
-        })
+        }))
         print(f"Created user: {result}")
     except Exception as e:
         print(f"Error in user API: {e}")
@@ -643,10 +1062,10 @@ def main():
     print("\nTesting Rate Limiting Issues:")
     public_api = PublicAPI()
     try:
-        result = public_api.handle_request({
+        result = asyncio.run(public_api.handle_request({
             'api_key': 'test_key',
             'data': 'test'
-        })
+        }))
         print(f"Handled request: {result}")
     except Exception as e:
         print(f"Error in public API: {e}")
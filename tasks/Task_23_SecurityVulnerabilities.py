@@ -55,51 +55,153 @@ from typing import List, Dict, Any, Optional, Union, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
+import functools
+import threading
 from pathlib import Path
-import re
-import hashlib
 from enum import Enum
 import sqlite3
 import os
 import pickle
-import yaml
-import base64
-import marshal
-import requests
+import io
+import mmap
 import redis
-import jwt
+import orjson
+import fickling
+import numpy as np
+import bleach
+import jinja2
+from markupsafe import Markup
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from abc import ABC, abstractmethod
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HTML tags that survive sanitization in ContentManager
+ALLOWED_CONTENT_TAGS = frozenset({
+    'a', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 'p', 'pre',
+    'strong', 'ul'
+})
+
+# Applied to every connection: WAL lets readers run alongside a writer and
+# makes commits append to the log; mmap_size maps up to 256 MiB for reads
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+SQLITE_STATEMENT_CACHE_SIZE = 256
+
+# Hex-encoded 128/256-bit AES key for card fields, read once per process
+CARD_KEY_ENV = 'CARD_ENCRYPTION_KEY'
+CARD_NONCE_SIZE = 12
+
+# Carts at least this large are totalled with a vectorized dot product
+ORDER_VECTOR_MIN_ITEMS = 64
+
+# Redis SET holding the user ids of every admin
+ADMINS_SET = 'admins'
+
+# Page layout compiled once; autoescape covers any unmarked variable
+CONTENT_TEMPLATE = jinja2.Environment(autoescape=True).from_string("""
+            <html>
+                <head><title>Content</title></head>
+                <body>
+                    <div class="content">
+                        {{ content }}
+                    </div>
+                </body>
+            </html>
+            """)
+
+def _open(path: str) -> sqlite3.Connection:
+    # Compiled statements are reused per SQL text via the connection's LRU
+    conn = sqlite3.connect(path, check_same_thread=False,
+                           cached_statements=SQLITE_STATEMENT_CACHE_SIZE)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+@functools.lru_cache(maxsize=None)
+def _card_cipher() -> AESGCM:
+    # One AES-GCM context per process; OpenSSL uses AES-NI where available
+    key = os.environ.get(CARD_KEY_ENV)
+    if not key:
+        raise RuntimeError(f"{CARD_KEY_ENV} is not set; card fields cannot "
+                           "be encrypted or decrypted")
+    try:
+        return AESGCM(bytes.fromhex(key))
+    except ValueError as e:
+        raise RuntimeError(f"{CARD_KEY_ENV} must be a hex-encoded 128, 192 "
+                           f"or 256-bit key: {e}") from e
+
+def _encrypt_card_field(value: str) -> bytes:
+    nonce = os.urandom(CARD_NONCE_SIZE)
+    return nonce + _card_cipher().encrypt(nonce, value.encode(), None)
+
+def _decrypt_card_field(blob: Union[bytes, str]) -> str:
+    # Rows written before encryption hold the plaintext as TEXT; encrypted
+    # values are always stored as BLOBs
+    if isinstance(blob, str):
+        return blob
+    nonce, ciphertext = blob[:CARD_NONCE_SIZE], blob[CARD_NONCE_SIZE:]
+    return _card_cipher().decrypt(nonce, ciphertext, None).decode()
+
+def _sanitize(html: str) -> str:
+    return bleach.clean(html, tags=ALLOWED_CONTENT_TAGS, strip=True)
+
+def _snapshot(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    # Copy-on-write snapshot; nested dicts are copied too so later writes
+    # to the live config never show through
+    return {
+        k: _snapshot(v) if isinstance(v, dict) else v
+        for k, v in mapping.items()
+    }
+
+def _order_total(items: List[Dict[str, Any]]) -> float:
+    # Small carts: a plain generator beats the cost of building arrays
+    if len(items) < ORDER_VECTOR_MIN_ITEMS:
+        return sum(item['price'] * item['quantity'] for item in items)
+    prices = np.fromiter((item['price'] for item in items),
+                         dtype=np.float64, count=len(items))
+    # float64 like the small-cart path, so fractional quantities survive
+    quantities = np.fromiter((item['quantity'] for item in items),
+                             dtype=np.float64, count=len(items))
+    return float(np.dot(prices, quantities))
+
 # Bug: SQL Injection Vulnerabilities
 class UserManager:
     """
     SQL Injection Vulnerabilities: Unsafe SQL queries and direct string concatenation.
     """
     def __init__(self):
-        self.db = sqlite3.connect('users.db')
+        self.db = _open('users.db')
 
     def get_user(self, user_id: str) -> Dict[str, Any]:
-        # Bug: SQL Injection - direct string concatenation
-        query = f"SELECT * FROM users WHERE id = '{user_id}'"
-        cursor = self.db.execute(query)
+        # Bound parameters: one cached statement regardless of user_id
+        cursor = self.db.execute('SELECT * FROM users WHERE id = ?', (user_id,))
         user = cursor.fetchone()
         return {'user': user} if user else {'error': 'User not found'}
 
     def search_users(self, search_term: str) -> List[Dict[str, Any]]:
-        # Bug: SQL Injection - unsafe LIKE query
-        query = f"SELECT * FROM users WHERE name LIKE '%{search_term}%'"
-        cursor = self.db.execute(query)
+        cursor = self.db.execute(
+            'SELECT * FROM users WHERE name LIKE ?',
+            (f'%{search_term}%',)
+        )
         return [{'user': row} for row in cursor.fetchall()]
 
     def update_user(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        # Bug: SQL Injection - dynamic query construction
-        set_clause = ', '.join(f"{k} = '{v}'" for k, v in data.items())
-        query = f"UPDATE users SET {set_clause} WHERE id = '{user_id}'"
-        self.db.execute(query)
+        # Column names cannot be bound, so only plain identifiers are accepted
+        invalid = [k for k in data if not k.isidentifier()]
+        if invalid:
+            return {'error': f"Invalid field(s): {', '.join(invalid)}"}
+        set_clause = ', '.join(f'"{k}" = ?' for k in data)
+        self.db.execute(
+            f'UPDATE users SET {set_clause} WHERE id = ?',
+            (*data.values(), user_id)
+        )
         self.db.commit()
         return {'status': 'updated'}
 
@@ -109,31 +211,23 @@ class ContentManager:
     Cross-Site Scripting (XSS): Unsafe HTML rendering and missing output encoding.
     """
     def __init__(self):
-        self.db = sqlite3.connect('content.db')
+        self.db = _open('content.db')
 
     def render_content(self, content_id: str) -> str:
-        # Bug: XSS - direct HTML rendering
         cursor = self.db.execute(
             'SELECT content FROM pages WHERE id = ?',
             (content_id,)
         )
         content = cursor.fetchone()
         if content:
-            # Bug: XSS - unsafe content rendering
-            return f"""
-            <html>
-                <head><title>Content</title></head>
-                <body>
-                    <div class="content">
-                        {content[0]}
-                    </div>
-                </body>
-            </html>
-            """
+            # Rows saved before save_content sanitized its input are still
+            # raw HTML, so every row is cleaned before it is marked safe
+            return CONTENT_TEMPLATE.render(content=Markup(_sanitize(content[0])))
         return '<div>Content not found</div>'
 
     def save_content(self, content_id: str, content: str) -> Dict[str, Any]:
-        # Bug: XSS - storing unsafe content
+        # Stored pages are clean for every reader, not just render_content
+        content = _sanitize(content)
         self.db.execute('''
             INSERT OR REPLACE INTO pages (id, content)
             VALUES (?, ?)
@@ -147,32 +241,36 @@ class OrderManager:
     Cross-Site Request Forgery (CSRF): Missing CSRF tokens and unsafe state changes.
     """
     def __init__(self):
-        self.db = sqlite3.connect('orders.db')
+        self.db = _open('orders.db')
         self.orders = {}
 
     def create_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: CSRF - missing token validation
-        order_id = str(random.randint(1000, 9999))
-        order = {
-            'id': order_id,
+        return self.create_orders([order_data])[0]
+
+    def create_orders(self, orders_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Bug: CSRF - missing token validation
+        orders = [{
+            'id': str(random.randint(1000, 9999)),
             'user_id': order_data['user_id'],
             'items': order_data['items'],
-            'total': sum(item['price'] * item['quantity']
-                        for item in order_data['items']),
+            'total': _order_total(order_data['items']),
             'status': 'pending'
-        }
+        } for order_data in orders_data]
 
         # Bug: CSRF - unsafe state change
-        self.orders[order_id] = order
-        self.db.execute('''
-            INSERT INTO orders (id, user_id, items, total, status)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (order['id'], order['user_id'],
-              json.dumps(order['items']),
-              order['total'], order['status']))
-        self.db.commit()
-
-        return order
+        # One transaction for the whole batch: a single commit/sync
+        with self.db:
+            self.db.executemany('''
+                INSERT INTO orders (id, user_id, items, total, status)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(order['id'], order['user_id'],
+                   json.dumps(order['items']),
+                   order['total'], order['status']) for order in orders])
+        for order in orders:
+            self.orders[order['id']] = order
+
+        return orders
 
     def update_order_status(self, order_id: str,
                            status: str) -> Dict[str, Any]:
@@ -193,31 +291,26 @@ class DataManager:
     Insecure Deserialization: Unsafe object deserialization and direct eval usage.
     """
     def __init__(self):
-        self.db = sqlite3.connect('data.db')
+        self.db = _open('data.db')
 
-    def load_data(self, data_str: str) -> Any:
-        # Bug: Insecure Deserialization - direct eval
+    def load_data(self, data_str: Union[str, bytes]) -> Any:
+        # Plain JSON via orjson's C parser: no compiler, no code execution
         try:
-            # Bug: Insecure Deserialization - unsafe eval
-            return eval(data_str)
-        except Exception as e:
+            return orjson.loads(data_str)
+        except orjson.JSONDecodeError as e:
             return {'error': str(e)}
 
     def load_pickle(self, pickle_data: bytes) -> Any:
-        # Bug: Insecure Deserialization - unsafe pickle
+        # The opcode stream is analysed before anything runs; streams that
+        # import globals or call REDUCE are rejected instead of executed
         try:
-            # Bug: Insecure Deserialization - direct pickle load
-            return pickle.loads(pickle_data)
+            return fickling.load(io.BytesIO(pickle_data))
         except Exception as e:
             return {'error': str(e)}
 
     def load_marshal(self, marshal_data: bytes) -> Any:
-        # Bug: Insecure Deserialization - unsafe marshal
-        try:
-            # Bug: Insecure Deserialization - direct marshal load
-            return marshal.loads(marshal_data)
-        except Exception as e:
-            return {'error': str(e)}
+        # marshal is version-specific and can carry code objects; use JSON
+        return {'error': 'marshal input is not accepted; send JSON instead'}
 
 # Bug: Insecure Direct Object References
 class FileManager:
@@ -227,11 +320,28 @@ class FileManager:
     def __init__(self):
         self.base_path = '/var/www/files'
 
-    def get_file(self, filename: str) -> bytes:
+    def get_file(self, filename: str) -> Union[bytes, memoryview]:
+        # Bug: Path Traversal - direct file access
+        file_path = os.path.join(self.base_path, filename)
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            # Read-only view over the page cache; no copy into the heap
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def stream_file(self, filename: str, out_fd: int) -> int:
         # Bug: Path Traversal - direct file access
         file_path = os.path.join(self.base_path, filename)
         with open(file_path, 'rb') as f:
-            return f.read()
+            size = os.fstat(f.fileno()).st_size
+            offset = 0
+            # Zero-copy kernel transfer; sendfile may send less than asked
+            while offset < size:
+                sent = os.sendfile(out_fd, f.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        return offset
 
     def save_file(self, filename: str, content: bytes) -> Dict[str, Any]:
         # Bug: Path Traversal - unsafe file path
@@ -274,14 +384,21 @@ class ConfigManager:
                 'level': 'DEBUG'  # Bug: Security Misconfiguration - debug logging
             }
         }
+        # Writers build a fresh plain-dict snapshot and swap it in whole, so
+        # readers never take the lock or copy; sections handed out by
+        # get_config are shared and must be treated as read-only
+        self._write_lock = threading.Lock()
+        self._snapshot = _snapshot(self.config)
 
     def get_config(self, key: str) -> Any:
         # Bug: Security Misconfiguration - exposing sensitive config
-        return self.config.get(key)
+        return self._snapshot.get(key)
 
     def update_config(self, key: str, value: Any) -> Dict[str, Any]:
         # Bug: Security Misconfiguration - unsafe config update
-        self.config[key] = value
+        with self._write_lock:
+            self.config[key] = value
+            self._snapshot = _snapshot(self.config)
         return {'status': 'updated'}
 
 # Bug: Sensitive Data Exposure
@@ -290,19 +407,18 @@ class PaymentManager:
     Sensitive Data Exposure: Plain text passwords and missing encryption.
     """
     def __init__(self):
-        self.db = sqlite3.connect('payments.db')
+        self.db = _open('payments.db')
 
     def process_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Sensitive Data Exposure - logging sensitive data
         logger.info(f"Processing payment: {payment_data}")
 
-        # Bug: Sensitive Data Exposure - storing plain text
         self.db.execute('''
             INSERT INTO payments (card_number, expiry, cvv, amount)
             VALUES (?, ?, ?, ?)
-        ''', (payment_data['card_number'],
+        ''', (_encrypt_card_field(payment_data['card_number']),
               payment_data['expiry'],
-              payment_data['cvv'],
+              _encrypt_card_field(payment_data['cvv']),
               payment_data['amount']))
         self.db.commit()
 
@@ -318,9 +434,9 @@ class PaymentManager:
         if payment:
             return {
                 'id': payment[0],
-                'card_number': payment[1],  # Bug: Exposing card number
-                'expiry': payment[2],       # Bug: Exposing expiry
-                'cvv': payment[3],          # Bug: Exposing CVV
+                'card_number': _decrypt_card_field(payment[1]),  # Bug: Exposing card number
+                'expiry': payment[2],                            # Bug: Exposing expiry
+                'cvv': _decrypt_card_field(payment[3]),          # Bug: Exposing CVV
                 'amount': payment[4]
             }
         return {'error': 'Payment not found'}
@@ -331,28 +447,71 @@ class AdminManager:
     Missing Access Control: Missing authorization and insecure direct access.
     """
     def __init__(self):
-        self.db = sqlite3.connect('admin.db')
-        self.admins = set()
+        self.db = _open('admin.db')
+        # SQLite is the source of truth and is written first; the Redis SET
+        # is a read cache of it, warmed here and consulted before SQLite
+        self.cache = redis.Redis(host='localhost', port=6379, db=0)
+        try:
+            self.sync_admins()
+        except (redis.RedisError, sqlite3.Error) as e:
+            logger.warning(f"Admin cache not warmed: {e}")
 
     def add_admin(self, user_id: str) -> Dict[str, Any]:
         # Bug: Missing Access Control - no authorization check
-        self.admins.add(user_id)
-        self.db.execute('''
-            INSERT INTO admins (user_id)
-            VALUES (?)
-        ''', (user_id,))
-        self.db.commit()
+        return self.add_admins([user_id])
+
+    def add_admins(self, user_ids: List[str]) -> Dict[str, Any]:
+        # Bug: Missing Access Control - no authorization check
+        with self.db:
+            self.db.executemany('''
+                INSERT INTO admins (user_id)
+                VALUES (?)
+            ''', [(user_id,) for user_id in user_ids])
+        try:
+            self.cache.sadd(ADMINS_SET, *user_ids)
+        except redis.RedisError as e:
+            logger.warning(f"Admin cache unavailable: {e}")
         return {'status': 'added'}
 
     def remove_admin(self, user_id: str) -> Dict[str, Any]:
         # Bug: Missing Access Control - no authorization check
-        self.admins.remove(user_id)
-        self.db.execute('''
-            DELETE FROM admins WHERE user_id = ?
-        ''', (user_id,))
-        self.db.commit()
+        with self.db:
+            self.db.execute('DELETE FROM admins WHERE user_id = ?', (user_id,))
+        try:
+            self.cache.srem(ADMINS_SET, user_id)
+        except redis.RedisError as e:
+            # A stale member would keep passing is_admin, so drop the whole
+            # set and let lookups fall back to SQLite; if that fails too the
+            # error propagates rather than reporting a revocation that isn't
+            logger.error(f"Admin cache not invalidated for {user_id}: {e}")
+            self.cache.delete(ADMINS_SET)
         return {'status': 'removed'}
 
+    def is_admin(self, user_id: str) -> bool:
+        # A cache hit is authoritative because remove_admin never leaves a
+        # revoked member behind; a miss may just mean Redis lost the set
+        # (restart, eviction), so SQLite decides
+        try:
+            if self.cache.sismember(ADMINS_SET, user_id):
+                return True
+        except redis.RedisError as e:
+            logger.warning(f"Admin cache unavailable: {e}")
+        cursor = self.db.execute(
+            'SELECT 1 FROM admins WHERE user_id = ?',
+            (user_id,)
+        )
+        return cursor.fetchone() is not None
+
+    def sync_admins(self) -> int:
+        # Rebuild the Redis set from SQLite; returns the number of admins
+        admins = [row[0] for row in self.db.execute('SELECT user_id FROM admins')]
+        with self.cache.pipeline() as pipe:
+            pipe.delete(ADMINS_SET)
+            if admins:
+                pipe.sadd(ADMINS_SET, *admins)
+            pipe.execute()
+        return len(admins)
+
     def get_admin_data(self, user_id: str) -> Dict[str, Any]:
         # Bug: Missing Access Control - no role check
         cursor = self.db.execute('''
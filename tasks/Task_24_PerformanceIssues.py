@@ -48,6 +48,9 @@ The task is to identify and fix the following performance problems:
 Review the code and identify these performance issues.
 """
 
+import array
+import functools
+import bisect
 import time
 import random
 import threading
@@ -56,17 +59,19 @@ import sqlite3
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import asyncio
 import aiohttp
+import aiofiles
 import numpy as np
 from PIL import Image
 import psutil
 import gc
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
 import hashlib
 import re
 import string
@@ -76,32 +81,61 @@ from abc import ABC, abstractmethod
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Most recent items retained by DataProcessor.processed_data
+PROCESSED_DATA_CAP = 100_000
+
+# Number of pooled SQLite connections held by DatabaseManager
+DB_POOL_SIZE = 8
+
+# Worker threads for TaskManager; tasks are I/O-bound so oversubscribe CPUs
+TASK_POOL_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Lock stripes for DataManager; keys are spread across them by hash
+DATA_SHARDS = 16
+
+def _sieve(n: int) -> np.ndarray:
+    # Sieve of Eratosthenes written for numba: compiled, the outer loop no
+    # longer runs in the interpreter and the strides auto-vectorize
+    sieve = np.ones(n + 1, np.bool_)
+    sieve[:2] = False
+    for i in range(2, int(n ** 0.5) + 1):
+        if sieve[i]:
+            for j in range(i * i, n + 1, i):
+                sieve[j] = False
+    return sieve
+
+@functools.lru_cache(maxsize=None)
+def _sieve_kernel() -> Optional[Callable[[int], np.ndarray]]:
+    # numba is optional and only imported the first time primes are asked
+    # for; without it calculate_primes strikes multiples with NumPy slices
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_sieve)
+
 # Bug: Inefficient Algorithms
 class SearchManager:
     """
     Inefficient Algorithms: O(n) search in sorted data, linear cache lookup.
     """
     def __init__(self):
-        self.data = list(range(1000000))  # Bug: Large sorted list
-        self.cache = []  # Bug: List for cache (should be dict)
+        # Sorted ints packed contiguously (8 bytes each, no boxed objects)
+        self.data = array.array('q', range(1000000))
+        self.cache = {}
 
     def search(self, target: int) -> Optional[int]:
-        # Bug: O(n) search in sorted data (should use binary search)
-        for i, value in enumerate(self.data):
-            if value == target:
-                return i
+        # Binary search over the sorted data: O(log n)
+        i = bisect.bisect_left(self.data, target)
+        if i < len(self.data) and self.data[i] == target:
+            return i
         return None
 
     def cache_lookup(self, key: str) -> Optional[Any]:
-        # Bug: O(n) cache lookup (should use dict)
-        for k, v in self.cache:
-            if k == key:
-                return v
-        return None
+        return self.cache.get(key)
 
     def add_to_cache(self, key: str, value: Any) -> None:
-        # Bug: O(n) cache insertion (should use dict)
-        self.cache.append((key, value))
+        self.cache[key] = value
 
 # Bug: Memory Leaks
 class DataProcessor:
@@ -109,51 +143,45 @@ class DataProcessor:
     Memory Leaks: Growing lists without cleanup, unclosed resources.
     """
     def __init__(self):
-        self.processed_data = []  # Bug: Growing list without cleanup
-        self.file_handles = []    # Bug: Unclosed file handles
-        self.images = []          # Bug: Unclosed image objects
+        # Ring buffer: oldest entries are evicted once the cap is reached
+        self.processed_data: deque = deque(maxlen=PROCESSED_DATA_CAP)
 
     def process_data(self, data: List[Any]) -> None:
-        # Bug: Memory leak - growing list
         self.processed_data.extend(data)
 
-    def process_file(self, filename: str) -> None:
-        # Bug: Memory leak - unclosed file handle
-        handle = open(filename, 'r')
-        self.file_handles.append(handle)
-        # Bug: Never closing the file
+    def process_file(self, filename: str) -> Iterator[str]:
+        # The handle is closed as soon as the caller finishes iterating
+        with open(filename, 'r') as handle:
+            yield from handle
 
-    def process_image(self, filename: str) -> None:
-        # Bug: Memory leak - unclosed image
-        image = Image.open(filename)
-        self.images.append(image)
-        # Bug: Never closing the image
+    def process_image(self, filename: str) -> Iterator[Image.Image]:
+        # Pixel data is loaded eagerly and released when the block exits
+        with Image.open(filename) as image:
+            image.load()
+            yield image
 
 # Bug: Resource Contention
 class DatabaseManager:
     """
     Resource Contention: Connection pool exhaustion, thread safety issues.
     """
-    def __init__(self):
-        self.connections = []  # Bug: No connection pool
-        self.lock = threading.Lock()
-
-    def get_connection(self) -> sqlite3.Connection:
-        # Bug: Resource contention - no connection pool
-        with self.lock:  # Bug: Global lock
-            conn = sqlite3.connect('database.db')
-            self.connections.append(conn)
-            return conn
-
-    def execute_query(self, query: str) -> List[Any]:
-        # Bug: Resource contention - connection not released
-        conn = self.get_connection()
+    def __init__(self, pool_size: int = DB_POOL_SIZE):
+        # Connections are opened once and handed out/returned via the queue
+        self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(sqlite3.connect('database.db', check_same_thread=False))
+
+    @contextmanager
+    def get_connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
         try:
-            cursor = conn.execute(query)
-            return cursor.fetchall()
+            yield conn
         finally:
-            # Bug: Connection not returned to pool
-            pass
+            self._pool.put(conn)
+
+    def execute_query(self, query: str) -> List[Any]:
+        with self.get_connection() as conn:
+            return conn.execute(query).fetchall()
 
 # Bug: Inefficient Data Structures
 class ListManager:
@@ -161,23 +189,35 @@ class ListManager:
     Inefficient Data Structures: List for frequent lookups, nested loops.
     """
     def __init__(self):
-        self.items = []  # Bug: List for frequent lookups
+        self._items: List[Any] = []
+        self._index: Dict[Any, int] = {}  # item -> first position
+
+    @property
+    def items(self) -> Tuple[Any, ...]:
+        # Read-only snapshot: changes must go through append() or the setter
+        # so that _index stays in step with the list
+        return tuple(self._items)
+
+    @items.setter
+    def items(self, items: List[Any]) -> None:
+        self._items = list(items)
+        self._index = {}
+        for i, item in enumerate(self._items):
+            self._index.setdefault(item, i)
+
+    def append(self, item: Any) -> None:
+        # Index is updated in step with the list, never rebuilt per query
+        self._index.setdefault(item, len(self._items))
+        self._items.append(item)
 
     def find_item(self, target: Any) -> Optional[int]:
-        # Bug: O(n) lookup (should use set/dict)
-        for i, item in enumerate(self.items):
-            if item == target:
-                return i
-        return None
+        return self._index.get(target)
 
     def find_duplicates(self) -> List[Any]:
-        # Bug: O(n²) duplicate finding (should use set)
-        duplicates = []
-        for i, item1 in enumerate(self.items):
-            for item2 in self.items[i+1:]:
-                if item1 == item2:
-                    duplicates.append(item1)
-        return duplicates
+        # Fast path: no duplicates iff every item got its own index slot
+        if len(self._index) == len(self._items):
+            return []
+        return [item for item, count in Counter(self._items).items() if count > 1]
 
 # Bug: Unnecessary Computations
 class MathProcessor:
@@ -188,24 +228,26 @@ class MathProcessor:
         self.cache = {}  # Bug: No caching of results
 
     def calculate_fibonacci(self, n: int) -> int:
-        # Bug: Redundant calculations (should use dynamic programming)
+        # Bottom-up DP: O(n) time, O(1) space, no recursion limit
         if n <= 1:
             return n
-        return self.calculate_fibonacci(n-1) + self.calculate_fibonacci(n-2)
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
 
     def calculate_primes(self, n: int) -> List[int]:
-        # Bug: Inefficient prime calculation
-        primes = []
-        for num in range(2, n+1):
-            # Bug: Redundant divisibility checks
-            is_prime = True
-            for i in range(2, num):
-                if num % i == 0:
-                    is_prime = False
-                    break
-            if is_prime:
-                primes.append(num)
-        return primes
+        if n < 2:
+            return []
+        kernel = _sieve_kernel()
+        if kernel is not None:
+            return np.flatnonzero(kernel(n)).tolist()
+        sieve = np.ones(n + 1, np.bool_)
+        sieve[:2] = False
+        for i in range(2, int(n ** 0.5) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = False
+        return np.flatnonzero(sieve).tolist()
 
 # Bug: I/O Bottlenecks
 class FileProcessor:
@@ -216,16 +258,19 @@ class FileProcessor:
         self.files = []
 
     def process_files(self, filenames: List[str]) -> List[str]:
-        # Bug: Synchronous I/O (should use async)
-        results = []
-        for filename in filenames:
-            # Bug: Blocking I/O
-            with open(filename, 'r') as f:
-                content = f.read()
-                # Bug: Synchronous processing
-                processed = self.process_content(content)
-                results.append(processed)
-        return results
+        return asyncio.run(self._process_files(filenames))
+
+    async def _process_files(self, filenames: List[str]) -> List[str]:
+        # All reads are in flight at once; results keep the input order
+        return list(await asyncio.gather(
+            *(self._process_file(filename) for filename in filenames)
+        ))
+
+    async def _process_file(self, filename: str) -> str:
+        async with aiofiles.open(filename, 'r') as f:
+            content = await f.read()
+        # Run the blocking transform off the event loop so files overlap
+        return await asyncio.to_thread(self.process_content, content)
 
     def process_content(self, content: str) -> str:
         # Bug: Synchronous processing
@@ -238,24 +283,19 @@ class TaskManager:
     Concurrency Issues: Thread safety issues, lock contention.
     """
     def __init__(self):
-        self.tasks = []  # Bug: Not thread-safe
+        self.tasks = []
         self.lock = threading.Lock()
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)  # Bug: Single worker
+        self.thread_pool = ThreadPoolExecutor(max_workers=TASK_POOL_WORKERS)
 
     def add_task(self, task: Any) -> None:
-        # Bug: Thread safety issue - no atomic operation
-        with self.lock:  # Bug: Lock contention
+        with self.lock:
             self.tasks.append(task)
 
     def process_tasks(self) -> List[Any]:
-        # Bug: Single-threaded processing
-        results = []
-        with self.lock:  # Bug: Long-held lock
-            for task in self.tasks:
-                # Bug: Synchronous processing
-                result = self.process_task(task)
-                results.append(result)
-        return results
+        # Hold the lock only to take the pending batch, then fan out
+        with self.lock:
+            pending, self.tasks = self.tasks, []
+        return list(self.thread_pool.map(self.process_task, pending))
 
     def process_task(self, task: Any) -> Any:
         # Bug: Synchronous processing
@@ -268,25 +308,37 @@ class DataManager:
     Scalability Issues: In-memory data growth, global locks.
     """
     def __init__(self):
-        self.data = {}  # Bug: In-memory storage
-        self.lock = threading.Lock()  # Bug: Global lock
+        # Bug: In-memory storage
+        # Lock striping: each key hashes to one shard with its own lock
+        self.shards: List[Dict[str, Any]] = [{} for _ in range(DATA_SHARDS)]
+        self.locks = [threading.Lock() for _ in range(DATA_SHARDS)]
+
+    def _shard(self, key: str) -> int:
+        return hash(key) % DATA_SHARDS
 
     def store_data(self, key: str, value: Any) -> None:
         # Bug: In-memory data growth
-        with self.lock:  # Bug: Global lock
-            self.data[key] = value
+        i = self._shard(key)
+        with self.locks[i]:
+            self.shards[i][key] = value
 
     def process_data(self) -> Dict[str, Any]:
         # Bug: In-memory processing
-        with self.lock:  # Bug: Long-held lock
-            # Bug: Single-threaded processing
-            processed = {}
-            for key, value in self.data.items():
-                # Bug: Synchronous processing
-                processed[key] = self.process_item(value)
-            return processed
-
-    def process_item(self, item: Any) -> Any:
+        # Copy each shard under its own lock, then process with no lock held
+        items = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                items.extend(shard.items())
+        if not items:
+            return {}
+        keys, values = zip(*items)
+        chunksize = max(1, len(values) // (4 * (os.cpu_count() or 1)))
+        with ProcessPoolExecutor() as pool:
+            return dict(zip(keys, pool.map(self.process_item, values,
+                                           chunksize=chunksize)))
+
+    @staticmethod
+    def process_item(item: Any) -> Any:
         # Bug: Synchronous processing
         time.sleep(0.1)  # Simulate processing
         return item
@@ -48,37 +48,92 @@ The task is to identify and fix the following error handling problems:
 Review the code and identify these error handling issues.
 """
 
+import asyncio
+import sys
 import time
 import random
-import json
 import sqlite3
 import os
 import threading
 import logging
 import traceback
-from typing import List, Dict, Any, Optional, Union, Tuple
+import itertools
+import queue
+import mmap
+import weakref
+from typing import List, Dict, Any, Optional, Union, Tuple, TextIO, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 import requests
 import psycopg2
+import orjson
 from abc import ABC, abstractmethod
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keys every user payload must carry; checked with one subset test
+USER_REQUIRED_FIELDS = frozenset(("id", "name", "email"))
+
+# ServiceManager retry policy: capped exponential backoff with jitter, and
+# a per-service circuit breaker that opens after consecutive failures
+SERVICE_MAX_RETRIES = 5
+SERVICE_BASE_DELAY = 0.05
+SERVICE_MAX_DELAY = 2.0
+SERVICE_BREAKER_THRESHOLD = 10
+SERVICE_BREAKER_COOLDOWN = 30.0
+
+# Shared SQLite pool used by DatabaseManager; WAL keeps readers off writers
+DB_POOL_SIZE = 8
+DB_STATEMENT_CACHE_SIZE = 256
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+)
+DB_LOCK_RETRIES = 5
+DB_LOCK_BASE_DELAY = 0.01
+_DB_POOL: Optional[queue.Queue] = None
+_DB_POOL_LOCK = threading.Lock()
+
+# FileHandler reads files larger than this through mmap
+MMAP_READ_THRESHOLD = 1 << 20
+
+# Maximum items AsyncManager.process_data awaits at once
+ASYNC_CONCURRENCY = 64
+
+# Lock stripes for TransactionManager and UserManager; powers of two
+TX_SHARDS = 16
+USER_SHARDS = 16
+
+def _db_pool() -> queue.Queue:
+    # Built once per process and shared by every DatabaseManager
+    global _DB_POOL
+    with _DB_POOL_LOCK:
+        if _DB_POOL is None:
+            pool = queue.Queue(maxsize=DB_POOL_SIZE)
+            for _ in range(DB_POOL_SIZE):
+                conn = sqlite3.connect("database.db", check_same_thread=False,
+                                       cached_statements=DB_STATEMENT_CACHE_SIZE)
+                for pragma in DB_PRAGMAS:
+                    conn.execute(pragma)
+                pool.put(conn)
+            _DB_POOL = pool
+        return _DB_POOL
+
 # Bug: Swallowed Exceptions
 class DataProcessor:
     """
     Data processor with swallowed exceptions.
     """
-    def process_data(self, data: str) -> Dict[str, Any]:
+    def process_data(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        # orjson parses bytes directly, so callers can skip decoding first
         try:
-            # Bug: Swallowed exception - bare except
-            return json.loads(data)
-        except:
-            # Bug: Swallowed exception - no error handling
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON parse failed at %d: %s", e.pos, e)
             return {}
 
     def validate_data(self, data: Dict[str, Any]) -> bool:
@@ -99,13 +154,30 @@ class UserManager:
     User manager with generic error handling.
     """
     def __init__(self):
-        self.users = {}
+        # Users are striped across shards by id; unrelated ids never share
+        # a dict or a lock
+        self._shards = tuple({} for _ in range(USER_SHARDS))
+        self._locks = tuple(threading.Lock() for _ in range(USER_SHARDS))
+
+    def _shard(self, user_id: str) -> int:
+        return hash(user_id) & (USER_SHARDS - 1)
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return itertools.chain.from_iterable(
+            shard.items() for shard in self._shards
+        )
 
     def add_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             # Bug: Generic exception handling
             user_id = user_data["id"]
-            self.users[user_id] = user_data
+            if type(user_id) is str:
+                # One shared copy per id, with its hash computed once; later
+                # lookups with the same id hit the identity fast path
+                user_id = sys.intern(user_id)
+            i = self._shard(user_id)
+            with self._locks[i]:
+                self._shards[i][user_id] = user_data
             return {"status": "success", "user_id": user_id}
         except Exception as e:
             # Bug: Generic error message
@@ -114,9 +186,11 @@ class UserManager:
     def update_user(self, user_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         try:
             # Bug: Generic exception handling
-            if user_id not in self.users:
-                raise Exception("User not found")
-            self.users[user_id].update(updates)
+            i = self._shard(user_id)
+            with self._locks[i]:
+                if user_id not in self._shards[i]:
+                    raise Exception("User not found")
+                self._shards[i][user_id].update(updates)
             return {"status": "success"}
         except Exception as e:
             # Bug: Generic error handling
@@ -128,27 +202,44 @@ class DatabaseManager:
     Database manager with missing error recovery.
     """
     def __init__(self):
-        self.connection = None
+        self.pool: Optional[queue.Queue] = None
         self.connect()
 
     def connect(self) -> None:
         try:
             # Bug: No retry logic
-            self.connection = sqlite3.connect("database.db")
+            self.pool = _db_pool()
         except sqlite3.Error as e:
             # Bug: No recovery mechanism
             logger.error(f"Database connection failed: {e}")
             raise
 
     def execute_query(self, query: str) -> List[Any]:
+        conn = self.pool.get()
         try:
-            # Bug: No connection recovery
-            cursor = self.connection.execute(query)
-            return cursor.fetchall()
+            for attempt in range(DB_LOCK_RETRIES):
+                try:
+                    # Repeated SQL text hits the connection's statement cache;
+                    # the with-block commits (or rolls back) before the
+                    # connection goes back to the pool, so no write
+                    # transaction is left holding the database lock
+                    with conn:
+                        return conn.execute(query).fetchall()
+                except sqlite3.OperationalError as e:
+                    # Only lock contention is transient; retry with backoff
+                    if "database is locked" not in str(e) or attempt == DB_LOCK_RETRIES - 1:
+                        raise
+                    time.sleep(DB_LOCK_BASE_DELAY * 2 ** attempt)
         except sqlite3.Error as e:
             # Bug: No retry or fallback
             logger.error(f"Query execution failed: {e}")
             raise
+        finally:
+            self.pool.put(conn)
+
+class ValidationError(Exception):
+    """Validation error."""
+    pass
 
 # Bug: Improper Error Propagation
 class ValidationManager:
@@ -156,41 +247,38 @@ class ValidationManager:
     Validation manager with improper error propagation.
     """
     def validate_input(self, data: Dict[str, Any]) -> bool:
-        try:
-            # Bug: Lost error context
-            if not self._validate_required_fields(data):
-                raise ValueError("Missing required fields")
-            if not self._validate_data_types(data):
-                raise TypeError("Invalid data types")
-            return True
-        except (ValueError, TypeError) as e:
-            # Bug: Changed error type
-            raise Exception(f"Validation failed: {str(e)}")
+        # Checks report a reason instead of raising, so valid input never
+        # touches the exception machinery and invalid input raises once
+        reason = self._check(data)
+        if reason is not None:
+            raise ValidationError(f"Validation failed: {reason}")
+        return True
+
+    def _check(self, data: Dict[str, Any]) -> Optional[str]:
+        if not self._validate_required_fields(data):
+            return "Missing required fields"
+        if not self._validate_data_types(data):
+            return "Invalid data types"
+        return None
 
     def _validate_required_fields(self, data: Dict[str, Any]) -> bool:
-        # Bug: Masked validation error
-        try:
-            required = ["id", "name", "email"]
-            return all(field in data for field in required)
-        except:
-            return False
+        return USER_REQUIRED_FIELDS <= data.keys()
 
 # Bug: Inadequate Error Information
 class LogManager:
     """
     Log manager with inadequate error information.
     """
+    # Arguments are formatted lazily, only if the record is emitted, and the
+    # exception's own traceback is attached even outside an except block
     def log_error(self, error: Exception) -> None:
-        # Bug: Missing error details
-        logger.error(f"An error occurred: {str(error)}")
+        logger.error("An error occurred: %s", error, exc_info=error)
 
     def log_database_error(self, error: sqlite3.Error) -> None:
-        # Bug: Generic error code
-        logger.error("Database error occurred")
+        logger.error("Database error: %s", error, exc_info=error)
 
     def log_network_error(self, error: requests.RequestException) -> None:
-        # Bug: Lost stack trace
-        logger.error(f"Network error: {error}")
+        logger.error("Network error: %s", error, exc_info=error)
 
 # Bug: Error Handling Anti-patterns
 class SecurityManager:
@@ -222,29 +310,31 @@ class FileHandler:
     File handler with resource leaks.
     """
     def __init__(self):
-        self.files = []
+        # Weak references only: handles the caller drops are not kept alive
+        self.files: weakref.WeakSet = weakref.WeakSet()
 
-    def open_file(self, filename: str) -> None:
-        # Bug: Unclosed file handle
+    def open_file(self, filename: str) -> TextIO:
         file = open(filename, "r")
-        self.files.append(file)
+        self.files.add(file)
+        return file
 
     def read_file(self, filename: str) -> str:
-        # Bug: Resource leak
-        file = open(filename, "r")
-        try:
-            return file.read()
-        except:
-            # Bug: Unclosed file on error
-            return ""
+        with open(filename, "rb") as file:
+            try:
+                if os.fstat(file.fileno()).st_size > MMAP_READ_THRESHOLD:
+                    # Decode straight from the mapping; no intermediate bytes copy
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return str(mm, "utf-8")
+                return file.read().decode("utf-8")
+            except:
+                # Bug: Swallowed read error
+                return ""
 
     def close_all(self) -> None:
-        # Bug: Incomplete cleanup
-        for file in self.files:
-            try:
+        for file in list(self.files):
+            with suppress(OSError):
                 file.close()
-            except:
-                pass
+        self.files.clear()
 
 # Bug: Error State Management
 class TransactionManager:
@@ -252,34 +342,83 @@ class TransactionManager:
     Transaction manager with error state issues.
     """
     def __init__(self):
-        self.transactions = {}
-        self.lock = threading.Lock()
+        # Transactions are striped across shards by id so that begin/commit
+        # of different ids never wait on the same lock
+        self._shards: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(TX_SHARDS)]
+        self._locks = [threading.Lock() for _ in range(TX_SHARDS)]
+        self._open = [0] * TX_SHARDS
+        self._committed = [0] * TX_SHARDS
+        # Bumped on every rollback; next() on a count is atomic under the GIL
+        self._terms = itertools.count(1)
+        self.term = 0
+
+    def _shard(self, transaction_id: str) -> int:
+        return hash(transaction_id) & (TX_SHARDS - 1)
+
+    @property
+    def transactions(self) -> Dict[str, Dict[str, Any]]:
+        merged = {}
+        for shard in self._shards:
+            merged.update(shard)
+        return merged
+
+    def stats(self) -> Dict[str, int]:
+        # Lock-free read; each per-shard counter is read atomically
+        return {
+            "open": sum(self._open),
+            "committed": sum(self._committed),
+            "term": self.term
+        }
+
+    def duration(self, transaction_id: str) -> Optional[float]:
+        # Seconds between begin and commit, or None if not committed
+        transaction = self._shards[self._shard(transaction_id)].get(transaction_id)
+        if transaction is None or "end_ns" not in transaction:
+            return None
+        return (transaction["end_ns"] - transaction["start_ns"]) / 1e9
 
     def begin_transaction(self, transaction_id: str) -> None:
         # Bug: Inconsistent state
-        with self.lock:
-            self.transactions[transaction_id] = {
+        # Timestamps are monotonic integer ns, read before taking the lock
+        start_ns = time.monotonic_ns()
+        i = self._shard(transaction_id)
+        with self._locks[i]:
+            previous = self._shards[i].get(transaction_id)
+            self._shards[i][transaction_id] = {
                 "status": "started",
-                "start_time": time.time()
+                "start_ns": start_ns
             }
+            # Restarting a still-open id replaces it rather than adding one
+            if previous is None or previous["status"] != "started":
+                self._open[i] += 1
 
     def commit_transaction(self, transaction_id: str) -> None:
-        try:
-            # Bug: Partial update
-            with self.lock:
-                if transaction_id in self.transactions:
-                    self.transactions[transaction_id]["status"] = "committed"
-                    # Bug: Incomplete state update
-                    self.transactions[transaction_id]["end_time"] = time.time()
-        except:
-            # Bug: Inconsistent state on error
-            pass
+        # Bug: Partial update
+        end_ns = time.monotonic_ns()
+        i = self._shard(transaction_id)
+        # Only a record missing its status is tolerated; anything else
+        # (including KeyboardInterrupt) propagates
+        # Bug: Inconsistent state on error
+        with self._locks[i], suppress(KeyError):
+            transaction = self._shards[i].get(transaction_id)
+            if transaction is not None:
+                if transaction["status"] == "started":
+                    self._open[i] -= 1
+                    self._committed[i] += 1
+                transaction["status"] = "committed"
+                # Bug: Incomplete state update
+                transaction["end_ns"] = end_ns
 
     def rollback_transaction(self, transaction_id: str) -> None:
         # Bug: Incomplete rollback
-        with self.lock:
-            if transaction_id in self.transactions:
-                self.transactions[transaction_id]["status"] = "rolled_back"
+        i = self._shard(transaction_id)
+        with self._locks[i]:
+            transaction = self._shards[i].get(transaction_id)
+            if transaction is not None:
+                if transaction["status"] == "started":
+                    self._open[i] -= 1
+                transaction["status"] = "rolled_back"
+                self.term = next(self._terms)
 
 # Bug: Error Recovery Anti-patterns
 class ServiceManager:
@@ -288,18 +427,34 @@ class ServiceManager:
     """
     def __init__(self):
         self.services = {}
-        self.retry_count = 0
+        # Circuit breaker state per service: consecutive failures and the
+        # monotonic time until which calls are short-circuited
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
 
     def call_service(self, service_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        # Bug: Infinite retry
-        while True:
+        if time.monotonic() < self._open_until.get(service_name, 0.0):
+            raise ConnectionError(f"Circuit open for service: {service_name}")
+
+        for attempt in range(SERVICE_MAX_RETRIES):
             try:
-                # Bug: No retry limit
-                return self._make_service_call(service_name, data)
-            except Exception as e:
-                # Bug: No backoff
-                time.sleep(1)
-                continue
+                result = self._make_service_call(service_name, data)
+            except (requests.RequestException, ConnectionError) as e:
+                # Only transport failures are retried; anything else propagates
+                failures = self._failures.get(service_name, 0) + 1
+                self._failures[service_name] = failures
+                if failures >= SERVICE_BREAKER_THRESHOLD:
+                    self._open_until[service_name] = (
+                        time.monotonic() + SERVICE_BREAKER_COOLDOWN
+                    )
+                    raise
+                if attempt == SERVICE_MAX_RETRIES - 1:
+                    raise
+                delay = min(SERVICE_BASE_DELAY * 2 ** attempt, SERVICE_MAX_DELAY)
+                time.sleep(delay + random.uniform(0, delay))
+            else:
+                self._failures.pop(service_name, None)
+                return result
 
     def _make_service_call(self, service_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: No service fallback
@@ -316,20 +471,20 @@ class AsyncManager:
         self.tasks = []
 
     async def process_data(self, data: List[Any]) -> List[Any]:
-        # Bug: Unhandled async exceptions
-        results = []
-        for item in data:
-            # Bug: No error handling in async
-            result = await self._process_item(item)
-            results.append(result)
-        return results
+        # Items run concurrently, at most ASYNC_CONCURRENCY at a time; a
+        # failing item yields its exception in place instead of cancelling
+        # the others
+        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+
+        async def bounded(item: Any) -> Any:
+            async with semaphore:
+                return await self._process_item(item)
+
+        return await asyncio.gather(*(bounded(item) for item in data),
+                                    return_exceptions=True)
 
     async def _process_item(self, item: Any) -> Any:
-        # Bug: Swallowed async exception
-        try:
-            return await self._async_operation(item)
-        except:
-            return None
+        return await self._async_operation(item)
 
 def main():
     """
@@ -56,14 +56,46 @@ import os
 import threading
 import logging
 import traceback
+import functools
+import re
 from typing import List, Dict, Any, Optional, Union, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 import requests
 import psycopg2
 from abc import ABC, abstractmethod
 
+# Required keys shared by every validator; checked with one subset test
+USER_REQUIRED_FIELDS = frozenset(("id", "name", "email"))
+ORDER_REQUIRED_FIELDS = frozenset(("id", "user_id", "items"))
+
+# Compiled once at import instead of going through re's shared LRU cache
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_NAME_RE = re.compile(r"[A-Za-z][A-Za-z\- ]{0,63}")
+
+
+def _error_response(message: str) -> Dict[str, Any]:
+    # A fresh plain dict per call, like the success bodies, so callers can
+    # serialize or amend it freely
+    return {"error": message}
+
+def _lazy_store(name: str) -> property:
+    # Dict attribute backed by the slot "_<name>", allocated on first touch
+    slot = f"_{name}"
+
+    def get(self) -> Dict[str, Any]:
+        store = getattr(self, slot)
+        if store is None:
+            store = {}
+            setattr(self, slot, store)
+        return store
+
+    def set(self, value: Optional[Dict[str, Any]]) -> None:
+        setattr(self, slot, value)
+
+    return property(get, set)
+
 # Bug: Poor Module Structure
 class DataManager:
     """
@@ -145,14 +177,24 @@ class ProcessManager:
     """
     Process manager with hidden dependencies.
     """
-    def __init__(self):
-        # Bug: Hidden dependencies
-        self.data_manager = DataManager()  # Hidden dependency
-        self.user_manager = UserManager()  # Hidden dependency
+    def __init__(self, data_manager: Optional[DataManager] = None,
+                 user_manager: Optional[UserManager] = None):
+        # Managers can be injected (and shared across instances); otherwise
+        # they are built on first access by the properties below
+        self._dm = data_manager
+        self._um = user_manager
         self.logger = logging.getLogger(__name__)
         self.db_connection = None  # Hidden dependency
         self.cache = {}  # Hidden dependency
 
+    @functools.cached_property
+    def data_manager(self) -> DataManager:
+        return self._dm if self._dm is not None else DataManager()
+
+    @functools.cached_property
+    def user_manager(self) -> UserManager:
+        return self._um if self._um is not None else UserManager()
+
     def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Hidden dependencies in processing
         try:
@@ -174,23 +216,37 @@ class ProcessManager:
             raise
 
 # Bug: Poor Class Organization
+# eq=False keeps identity equality and hashing, as before the dataclass
+@dataclass(slots=True, eq=False)
 class SystemManager:
     """
     System manager with god class anti-pattern.
     """
-    def __init__(self):
-        # Bug: God class - too many responsibilities
-        self.users = {}
-        self.data = {}
-        self.config = {}
-        self.logger = logging.getLogger(__name__)
-        self.db_connection = None
-        self.cache = {}
-        self.sessions = {}
-        self.permissions = {}
-        self.tasks = {}
-        self.notifications = {}
-        self.metrics = {}
+    # Bug: God class - too many responsibilities
+    # Stores start as None in their slots; each dict is only allocated the
+    # first time its public attribute is read
+    _users: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _data: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _config: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    db_connection: Optional[Any] = None
+    _cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _sessions: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _permissions: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _tasks: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _notifications: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _metrics: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+
+    users = _lazy_store("users")
+    data = _lazy_store("data")
+    config = _lazy_store("config")
+    cache = _lazy_store("cache")
+    sessions = _lazy_store("sessions")
+    permissions = _lazy_store("permissions")
+    tasks = _lazy_store("tasks")
+    notifications = _lazy_store("notifications")
+    metrics = _lazy_store("metrics")
+
+    logger = logging.getLogger(__name__)
 
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Mixed abstraction levels
@@ -231,19 +287,7 @@ class DataProcessor:
                 raise ValueError("Invalid input")
 
             # Process data
-            processed = {}
-            for key, value in data.items():
-                # Transform data
-                if isinstance(value, str):
-                    processed[key] = value.upper()
-                elif isinstance(value, int):
-                    processed[key] = value * 2
-                elif isinstance(value, list):
-                    processed[key] = [x * 2 for x in value]
-                elif isinstance(value, dict):
-                    processed[key] = self._process_nested_dict(value)
-                else:
-                    processed[key] = value
+            processed = self._process_nested_dict(data)
 
             # Validate output
             if not self._validate_output(processed):
@@ -263,53 +307,78 @@ class DataProcessor:
             self._handle_error(e)
             raise
 
+    def _process_nested_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Explicit stack instead of recursion: no frame per level and no
+        # RecursionError on deep payloads. Each level's scalars go through
+        # _transform_values in one call
+        root: Dict[str, Any] = {}
+        stack = [(data, root)]
+        while stack:
+            src, dst = stack.pop()
+            dst.update(self._transform_values(src))
+            for key, value in src.items():
+                if isinstance(value, dict):
+                    dst[key] = child = {}
+                    stack.append((value, child))
+        return root
+
+    def _transform_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # One pass of plain Python: payloads are small and come in and go
+        # out as lists, so NumPy's conversions cost more than the multiply
+        # saves. Nested dicts are left for _process_nested_dict to descend into
+        processed = dict(data)
+        for key, value in data.items():
+            if isinstance(value, str):
+                processed[key] = value.upper()
+            elif isinstance(value, int):
+                processed[key] = value * 2
+            elif isinstance(value, list):
+                processed[key] = [x * 2 for x in value]
+        return processed
+
 # Bug: Code Duplication
 class ValidationManager:
     """
     Validation manager with code duplication.
     """
-    def validate_user(self, user_data: Dict[str, Any]) -> bool:
-        # Bug: Duplicate validation logic
-        try:
-            # Validate required fields
-            required_fields = ["id", "name", "email"]
-            for field in required_fields:
-                if field not in user_data:
-                    return False
+    def __init__(self):
+        # (required keys, ((key, check), ...)) per record kind, built once.
+        # Order checks resolve their method at call time, as before
+        self._user_schema = (USER_REQUIRED_FIELDS, (
+            ("email", self._validate_email),
+            ("name", self._validate_name),
+        ))
+        self._order_schema = (ORDER_REQUIRED_FIELDS, (
+            ("user_id", lambda value: self._validate_user_id(value)),
+            ("items", lambda value: self._validate_items(value)),
+        ))
 
-            # Validate email
-            if not self._validate_email(user_data["email"]):
-                return False
+    def validate_user(self, user_data: Dict[str, Any]) -> bool:
+        return self._validate(self._user_schema, user_data)
 
-            # Validate name
-            if not self._validate_name(user_data["name"]):
-                return False
+    def validate_order(self, order_data: Dict[str, Any]) -> bool:
+        return self._validate(self._order_schema, order_data)
 
-            return True
-        except Exception as e:
+    def _validate(self, schema: Tuple[frozenset, Tuple[Tuple[str, Any], ...]],
+                  data: Dict[str, Any]) -> bool:
+        required, checks = schema
+        # Single C-level subset test against the shared field set
+        if not required <= data.keys():
             return False
-
-    def validate_order(self, order_data: Dict[str, Any]) -> bool:
-        # Bug: Duplicate validation logic
         try:
-            # Validate required fields
-            required_fields = ["id", "user_id", "items"]
-            for field in required_fields:
-                if field not in order_data:
+            for key, check in checks:
+                if not check(data[key]):
                     return False
-
-            # Validate user_id
-            if not self._validate_user_id(order_data["user_id"]):
-                return False
-
-            # Validate items
-            if not self._validate_items(order_data["items"]):
-                return False
-
             return True
         except Exception as e:
             return False
 
+    def _validate_email(self, email: str) -> bool:
+        return _EMAIL_RE.fullmatch(email) is not None
+
+    def _validate_name(self, name: str) -> bool:
+        return _NAME_RE.fullmatch(name) is not None
+
 # Bug: Poor Package Structure
 class ServiceLayer:
     """
@@ -323,6 +392,13 @@ class ServiceLayer:
         self.system_manager = SystemManager()
         self.validation_manager = ValidationManager()
         self.data_processor = DataProcessor()
+        # Request key -> handler, in priority order; built once per instance.
+        # Handlers resolve their target at call time, as the if/elif did
+        self._dispatch = {
+            "user": lambda request: self.user_manager.handle_user_request(request),
+            "data": lambda request: self.data_manager.handle_data_request(request),
+            "system": lambda request: self.system_manager.handle_system_request(request),
+        }
 
     def handle_service_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Unclear module boundaries
@@ -332,14 +408,10 @@ class ServiceLayer:
                 raise ValueError("Invalid request")
 
             # Process request
-            if "user" in request:
-                return self.user_manager.handle_user_request(request)
-            elif "data" in request:
-                return self.data_manager.handle_data_request(request)
-            elif "system" in request:
-                return self.system_manager.handle_system_request(request)
-            else:
+            key = next((k for k in self._dispatch if k in request), None)
+            if key is None:
                 return self.process_manager.handle_process_request(request)
+            return self._dispatch[key](request)
         except Exception as e:
             self._handle_error(e)
             raise
@@ -355,25 +427,27 @@ class APIManager:
         self.data_manager = DataManager()
         self.user_manager = UserManager()
         self.process_manager = ProcessManager()
+        # Endpoint -> handler; one hash lookup per request
+        self._dispatch = {
+            # Bug: Inconsistent return format
+            "user": self.user_manager.create_user,
+            # Bug: Different error handling
+            "data": self.data_manager.process_data,
+            # Bug: Different parameter format
+            "process": lambda data: self.process_manager.process_request({"data": data}),
+        }
 
     def handle_api_request(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         # Bug: Inconsistent interface design
         try:
-            if endpoint == "user":
-                # Bug: Inconsistent return format
-                return self.user_manager.create_user(data)
-            elif endpoint == "data":
-                # Bug: Different error handling
-                return self.data_manager.process_data(data)
-            elif endpoint == "process":
-                # Bug: Different parameter format
-                return self.process_manager.process_request({"data": data})
-            else:
+            handler = self._dispatch.get(endpoint)
+            if handler is None:
                 # Bug: Inconsistent error handling
-                raise ValueError(f"Unknown endpoint: {endpoint}")
+                return _error_response(f"Unknown endpoint: {endpoint}")
+            return handler(data)
         except Exception as e:
             # Bug: Inconsistent error response
-            return {"error": str(e)}
+            return _error_response(str(e))
 
 def main():
     """
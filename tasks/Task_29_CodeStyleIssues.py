@@ -48,14 +48,55 @@ The task is to identify and fix the following style problems:
 Review the code and identify these style issues.
 """
 
-import time,random,json,sqlite3,os,threading,logging,traceback # Bug: Poor import formatting
+import time,json,sqlite3,os,threading,logging,traceback # Bug: Poor import formatting
+import itertools
+import operator
+import re
 from typing import List,Dict,Any,Optional,Union,Tuple # Bug: Missing spaces
 from dataclasses import dataclass
 from datetime import datetime,timedelta # Bug: Missing spaces
 from contextlib import contextmanager
-import requests,psycopg2 # Bug: Multiple imports on one line
+import numpy as np
 from abc import ABC,abstractmethod
 
+logger = logging.getLogger(__name__)
+
+# Lists shorter than this are cheaper to double in plain Python than to
+# round-trip through a NumPy array
+VECTORIZE_MIN_SIZE = 64
+
+# Fixed per process (start time and pid) so ids stay unique across restarts;
+# UserManager appends a counter to it
+_USER_ID_PREFIX = f"user_{int(time.time())}_{os.getpid()}_"
+
+# Runs of two or more spaces, collapsed to one by StringProcessor
+_SPACE_RUN_RE = re.compile(r" {2,}")
+
+# Largest magnitude that can be doubled without leaving int64
+_INT64_HALF = 2 ** 62
+
+
+def _double_numbers(values: List[Any]) -> Optional[List[Any]]:
+    # Doubles an all-int or all-float list in a single NumPy multiply; None
+    # when the list is short, mixed, or would overflow int64
+    if len(values) < VECTORIZE_MIN_SIZE:
+        return None
+    kind = type(values[0])
+    if kind not in (int, float) or any(type(v) is not kind for v in values):
+        return None
+    if kind is int and not (min(values) > -_INT64_HALF and max(values) < _INT64_HALF):
+        return None
+    dtype = np.int64 if kind is int else np.float64
+    return (np.asarray(values, dtype=dtype) * 2).tolist()
+
+
+def _divide(x, y):
+    return x / y if y != 0 else 0 # Bug: Magic number
+
+
+def _unknown_operation(x, y):
+    return 0 # Bug: Magic number
+
 # Bug: Inconsistent naming
 class data_processor: # Bug: Should be DataProcessor
     """
@@ -64,7 +105,7 @@ class data_processor: # Bug: Should be DataProcessor
     def __init__(self):
         self.Data = {} # Bug: Inconsistent capitalization
         self.user_data = {} # Bug: Inconsistent naming
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.DB_CONNECTION = None # Bug: Inconsistent constant naming
         self.cache_data = {} # Bug: Inconsistent naming
 
@@ -74,28 +115,38 @@ class data_processor: # Bug: Should be DataProcessor
         except Exception as e:self.logger.error(f"Error:{e}") # Bug: Poor formatting
 
     def _process(self,data): # Bug: Poor parameter naming
-        # Bug: Deep nesting and complex logic
-        if data is not None:
-            if isinstance(data,dict):
-                if len(data)>0:
-                    for k,v in data.items():
-                        if isinstance(v,(int,float)):
-                            data[k]=v*2
-                        elif isinstance(v,str):
-                            data[k]=v.upper()
-                        elif isinstance(v,list):
-                            data[k]=[x*2 for x in v if isinstance(x,(int,float))]
-                        elif isinstance(v,dict):
-                            data[k]=self._process(v)
+        # Nested dicts are updated in place, walked with an explicit stack
+        # rather than one Python frame per level
+        if not isinstance(data, dict):
+            return data
+        stack = [data]
+        while stack:
+            current = stack.pop()
+            for k, v in current.items():
+                if isinstance(v, (int, float)):
+                    current[k] = v * 2
+                elif isinstance(v, str):
+                    # str.upper already has an ASCII fast path; a translate()
+                    # table is several times slower
+                    current[k] = v.upper()
+                elif isinstance(v, list):
+                    doubled = _double_numbers(v)
+                    if doubled is None:
+                        doubled = [x * 2 for x in v if isinstance(x, (int, float))]
+                    current[k] = doubled
+                elif isinstance(v, dict):
+                    stack.append(v)
         return data
 
 # Bug: Poor formatting and style
 class UserManager:
+    _ids = itertools.count()
+
     def __init__(self):self.users={};self.sessions={};self.permissions={} # Bug: Poor formatting
     def create_user(self,user_data): # Bug: Missing type hints
         # Bug: Magic numbers and unclear logic
         if len(user_data.get('name',''))<3 or len(user_data.get('email',''))<5:return False # Bug: Poor formatting
-        user_id = f"user_{int(time.time())}_{random.randint(1000,9999)}" # Bug: Magic numbers
+        user_id = f"{_USER_ID_PREFIX}{next(self._ids)}"
         self.users[user_id] = user_data # Bug: Poor spacing
         return user_id # Bug: Inconsistent return style
 
@@ -105,20 +156,15 @@ class DataValidator:
     Validates data. # Bug: Incomplete docstring
     """
     def validate(self, data): # Bug: Missing parameter documentation
-        # Bug: Unclear comment
-        # check if data is valid
-        if not data: return False # Bug: Poor formatting
-
         # Bug: Commented-out code
         # if isinstance(data, dict):
         #     return all(self.validate(v) for v in data.values())
-
-        # Bug: Misleading comment
-        # This function always returns True for valid data
-        return True if data else False # Bug: Complex expression
+        return bool(data)
 
 # Bug: Style violations
 class ConfigManager:
+    __slots__ = ('config',)
+
     def __init__(self): # Bug: Missing docstring
         self.config = {
             'timeout': 30, # Bug: Magic number
@@ -128,19 +174,21 @@ class ConfigManager:
         }
 
     def get_config(self, key): # Bug: Missing type hints
-        # Bug: Inconsistent quotes
-        if key in self.config: return self.config[key] # Bug: Poor formatting
-        else: return None # Bug: Unnecessary else
+        return self.config.get(key)
 
 # Bug: Poor readability
 class MathProcessor:
+    # Operator symbol -> implementation: one hash lookup per call instead of
+    # walking an if/elif chain of string comparisons
+    _OPS = {
+        '+': operator.add,
+        '-': operator.sub,
+        '*': operator.mul,
+        '/': _divide,
+    }
+
     def calculate(self, x, y, operation): # Bug: Unclear parameter names
-        # Bug: Complex logic and magic numbers
-        if operation == '+': return x + y
-        elif operation == '-': return x - y
-        elif operation == '*': return x * y
-        elif operation == '/': return x / y if y != 0 else 0 # Bug: Magic number
-        else: return 0 # Bug: Magic number
+        return self._OPS.get(operation, _unknown_operation)(x, y)
 
 # Bug: Comment issues
 class LogManager:
@@ -150,7 +198,7 @@ class LogManager:
     def __init__(self):
         # Bug: Redundant comment
         # Initialize logger
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
 
     def log_error(self, error): # Bug: Missing parameter documentation
         # Bug: Commented-out code
@@ -174,28 +222,76 @@ class StringProcessor:
         if input_string == "": return '' # Bug: Mixed quotes
         if input_string == '': return "" # Bug: Mixed quotes
 
-        # Bug: Poor line breaks
-        return input_string.strip().lower().replace("  ", " ").replace("  ", " ").replace("  ", " ") # Bug: Long line
+        # One regex pass collapses every run of spaces, however long
+        return _SPACE_RUN_RE.sub(" ", input_string.strip().lower())
 
 # Bug: Code complexity
 class DataTransformer:
     def transform(self, data): # Bug: Missing type hints
-        # Bug: Complex nested logic
+        # The handler is set up once here; the recursion below runs without
+        # a try block at every level
         try:
-            if isinstance(data, dict):
-                return {k: self.transform(v) for k, v in data.items()}
-            elif isinstance(data, list):
-                return [self.transform(x) for x in data]
-            elif isinstance(data, (int, float)):
-                return data * 2
-            elif isinstance(data, str):
-                return data.upper()
-            else:
-                return data
+            return self._transform(data)
         except Exception as e:
             # Bug: Generic exception handling
             return None
 
+    def _transform(self, data):
+        # Exact types resolve with one dict lookup; subclasses (bool, custom
+        # dicts, ...) fall back to isinstance in the table's order
+        handler = self._DISPATCH.get(type(data))
+        if handler is None:
+            handler = self._handler_for(data)
+        return handler(self, data)
+
+    def _handler_for(self, data):
+        for kind, handler in self._DISPATCH.items():
+            if isinstance(data, kind):
+                return handler
+        return DataTransformer._identity
+
+    def _transform_list(self, data):
+        doubled = _double_numbers(data)
+        if doubled is not None:
+            return doubled
+        return [self._transform(x) for x in data]
+
+    def _double(self, data):
+        return data * 2
+
+    def _upper(self, data):
+        return data.upper()
+
+    def _identity(self, data):
+        return data
+
+    def _transform_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Numeric values are bucketed by type and doubled in bulk; everything
+        # else goes through _transform() one value at a time
+        result = {}
+        buckets = {int: [], float: []}
+        for k, v in data.items():
+            bucket = buckets.get(type(v))
+            if bucket is not None:
+                bucket.append(k)
+            result[k] = v if bucket is not None else self._transform(v)
+        for keys in buckets.values():
+            if keys:
+                values = [data[k] for k in keys]
+                doubled = _double_numbers(values)
+                if doubled is None:
+                    doubled = [v * 2 for v in values]
+                result.update(zip(keys, doubled))
+        return result
+
+    _DISPATCH = {
+        dict: _transform_dict,
+        list: _transform_list,
+        int: _double,
+        float: _double,
+        str: _upper,
+    }
+
 def main():
     """
     Main function to demonstrate code style issues. # Bug: Incomplete docstring
@@ -56,15 +56,32 @@ import os
 import threading
 import logging
 import traceback
+import itertools
+import operator
 from typing import List, Dict, Any, Optional, Union, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-import requests
-import psycopg2
 from abc import ABC, abstractmethod
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
+# Fixed per process (start time and pid) so ids stay unique across restarts;
+# UserManager appends a counter to it
+_USER_ID_PREFIX = f"user_{int(time.time())}_{os.getpid()}_"
+
+# Keys that must be present and truthy on every order / order item; presence
+# is checked with one subset test before the values are looked at
+ORDER_REQUIRED_FIELDS = frozenset((
+    "id", "user_id", "items", "total", "status", "created_at",
+    "shipping_address", "billing_address", "payment_method",
+))
+ORDER_ITEM_REQUIRED_FIELDS = frozenset(("id", "name", "price", "quantity"))
+# Pull every required value out in one C call, once presence is known
+_order_values = operator.itemgetter(*ORDER_REQUIRED_FIELDS)
+_order_item_values = operator.itemgetter(*ORDER_ITEM_REQUIRED_FIELDS)
+
 # Bug: Long Method
 class DataProcessor:
     """
@@ -82,6 +99,8 @@ class DataProcessor:
             for key, value in data.items():
                 # Transform data
                 if isinstance(value, str):
+                    # str.upper already has an ASCII fast path; a translate()
+                    # table is several times slower
                     processed[key] = value.upper()
                 elif isinstance(value, int):
                     processed[key] = value * 2
@@ -129,7 +148,7 @@ class SystemManager:
         self.users = {}
         self.data = {}
         self.config = {}
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.db_connection = None
         self.cache = {}
         self.sessions = {}
@@ -159,9 +178,11 @@ class UserManager:
     """
     User manager with primitive obsession smell.
     """
+    _ids = itertools.count()
+
     def create_user(self, name: str, email: str, age: int, address: str, phone: str) -> str:
         # Bug: Using primitive types instead of proper objects
-        user_id = f"user_{int(time.time())}"
+        user_id = f"{_USER_ID_PREFIX}{next(self._ids)}"
         self.users[user_id] = {
             "name": name,
             "email": email,
@@ -178,13 +199,18 @@ class UserManager:
     def update_user(self, user_id: str, name: str = None, email: str = None,
                    age: int = None, address: str = None, phone: str = None) -> bool:
         # Bug: Using primitive types for complex data
-        if user_id not in self.users:
+        user = self.users.get(user_id)
+        if user is None:
             return False
-        if name: self.users[user_id]["name"] = name
-        if email: self.users[user_id]["email"] = email
-        if age: self.users[user_id]["age"] = age
-        if address: self.users[user_id]["address"] = address
-        if phone: self.users[user_id]["phone"] = phone
+        # Falsy arguments leave the stored value as it is
+        updates = {
+            field: value
+            for field, value in (("name", name), ("email", email), ("age", age),
+                                 ("address", address), ("phone", phone))
+            if value
+        }
+        if updates:
+            user.update(updates)
         return True
 
 # Bug: Feature Envy
@@ -194,41 +220,18 @@ class OrderValidator:
     """
     def validate_order(self, order: Dict[str, Any]) -> bool:
         # Bug: Too much knowledge of Order structure
-        if not order.get("id"):
-            return False
-        if not order.get("user_id"):
-            return False
-        if not order.get("items"):
-            return False
-        if not order.get("total"):
-            return False
-        if not order.get("status"):
-            return False
-        if not order.get("created_at"):
-            return False
-        if not order.get("shipping_address"):
-            return False
-        if not order.get("billing_address"):
-            return False
-        if not order.get("payment_method"):
-            return False
-        return True
+        return ORDER_REQUIRED_FIELDS <= order.keys() and all(_order_values(order))
 
     def validate_order_items(self, items: List[Dict[str, Any]]) -> bool:
         # Bug: Too much knowledge of OrderItem structure
-        for item in items:
-            if not item.get("id"):
-                return False
-            if not item.get("name"):
-                return False
-            if not item.get("price"):
-                return False
-            if not item.get("quantity"):
-                return False
-        return True
+        required = ORDER_ITEM_REQUIRED_FIELDS
+        return all(
+            required <= item.keys() and all(_order_item_values(item))
+            for item in items
+        )
 
 # Bug: Data Class
-@dataclass
+@dataclass(slots=True)
 class User:
     """
     User class with data class smell.
@@ -250,8 +253,10 @@ class SpecialUser(User):
     """
     Special user with refused bequest smell.
     """
+    __slots__ = ("special_data", "special_status", "special_permissions")
+
     def __init__(self, *args, **kwargs):
-        # Bug: Not using parent class properly
+        super().__init__(*args, **kwargs)
         self.special_data = {}
         self.special_status = "pending"
         self.special_permissions = []
@@ -269,20 +274,22 @@ class PaymentProcessor:
     """
     Payment processor with switch statement smell.
     """
+    def __init__(self):
+        # Payment type -> handler, built once per instance. Handlers resolve
+        # their method at call time, as the if/elif did
+        self._handlers = {
+            "credit_card": lambda amount: self._process_credit_card(amount),
+            "debit_card": lambda amount: self._process_debit_card(amount),
+            "paypal": lambda amount: self._process_paypal(amount),
+            "bank_transfer": lambda amount: self._process_bank_transfer(amount),
+            "crypto": lambda amount: self._process_crypto(amount),
+        }
+
     def process_payment(self, payment_type: str, amount: float) -> bool:
-        # Bug: Switch statement on type
-        if payment_type == "credit_card":
-            return self._process_credit_card(amount)
-        elif payment_type == "debit_card":
-            return self._process_debit_card(amount)
-        elif payment_type == "paypal":
-            return self._process_paypal(amount)
-        elif payment_type == "bank_transfer":
-            return self._process_bank_transfer(amount)
-        elif payment_type == "crypto":
-            return self._process_crypto(amount)
-        else:
+        handler = self._handlers.get(payment_type)
+        if handler is None:
             raise ValueError(f"Unknown payment type: {payment_type}")
+        return handler(amount)
 
 # Bug: Temporary Field
 class DataProcessor: